@@ -5,12 +5,20 @@ Build script for ReaTC.
 Substitutes {{VERSION}} (and {{CHANGELOG}}) in source files and copies src/ → dist/.
 Version is passed via --version flag (default: DEV).
 index.xml is generated by reapack-index on the reapack branch — not by this script.
+
+Builds are incremental: a content-hash manifest (dist/.manifest-<name>-<version>.json)
+records every output, and files whose content is unchanged after substitution are
+not rewritten. README.pdf is only regenerated when README.md or images/ change.
+Pass --clean to wipe dist/ and rebuild everything (used for releases).
 """
 
+import hashlib
+import json
 import subprocess
 import sys
 import shutil
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 BUILD_DIR = Path(__file__).parent
@@ -33,6 +41,47 @@ def parse_env(path):
     return config
 
 
+def manifest_path(dist_dir):
+    """Path of the build manifest for a dist directory (kept outside the package)."""
+    return dist_dir.parent / f".manifest-{dist_dir.name}.json"
+
+
+def load_manifest(path):
+    """Load a build manifest, or return an empty one if missing/corrupt."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"files": {}, "inputs": {}, "changed": []}
+    manifest.setdefault("files", {})
+    manifest.setdefault("inputs", {})
+    manifest.setdefault("changed", [])
+    return manifest
+
+
+def save_manifest(path, manifest):
+    """Write a build manifest (sorted keys keep diffs stable)."""
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n",
+                    encoding="utf-8")
+
+
+def content_hash(data):
+    """SHA-256 hex digest of a bytes payload."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def write_if_changed(dest, data, old_digest):
+    """Write data to dest unless it already holds identical content.
+
+    Returns (digest, changed).
+    """
+    digest = content_hash(data)
+    if digest == old_digest and dest.exists():
+        return digest, False
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_bytes(data)
+    return digest, True
+
+
 def substitute_version(content, version):
     """Replace {{VERSION}} placeholder with actual version"""
     return content.replace("{{VERSION}}", version)
@@ -108,8 +157,8 @@ def generate_readme_pdf(dist_dir):
         clean_md.unlink(missing_ok=True)
 
 
-def build(version="DEV"):
-    """Build and distribute files"""
+def build(version="DEV", clean=False):
+    """Build and distribute files (incrementally unless clean=True)"""
     try:
         print(f"Building ReaTC v{version}...")
         print()
@@ -127,81 +176,131 @@ def build(version="DEV"):
         # Install path: <type>/<index_name>/<category>/<file>
         dist_dir = DIST_BASE / f"{index_name}-{version}"
 
-        # Clean dist directory
-        if DIST_BASE.exists():
+        # Clean dist directory (full rebuild) — otherwise build incrementally
+        if clean and DIST_BASE.exists():
             shutil.rmtree(DIST_BASE)
             print("  ✓ Cleaned previous dist/")
 
-        # Create REAPER resource folder structure
-        dist_scripts_dir = dist_dir / "Scripts" / index_name / category
-        dist_effects_dir = dist_dir / "Effects" / index_name / category
-        dist_scripts_dir.mkdir(parents=True, exist_ok=True)
-        dist_effects_dir.mkdir(parents=True, exist_ok=True)
+        dist_dir.mkdir(parents=True, exist_ok=True)
+        manifest_file = manifest_path(dist_dir)
+        old = load_manifest(manifest_file)
+        old_files = old["files"]
 
         changelog = read_changelog_for_version(version)
 
-        # Process source files: substitute version and copy to dist
+        # Collect outputs as (relative path, producer) jobs
+        scripts_rel = Path("Scripts") / index_name / category
+        effects_rel = Path("Effects") / index_name / category
         src_dirs = [
-            (SRC_DIR / "Scripts" / "ReaTC", dist_scripts_dir),
-            (SRC_DIR / "Effects" / "ReaTC", dist_effects_dir),
+            (SRC_DIR / "Scripts" / "ReaTC", scripts_rel),
+            (SRC_DIR / "Effects" / "ReaTC", effects_rel),
         ]
 
-        files_processed = 0
-        for src_dir, dest_dir in src_dirs:
+        def render_source(filepath):
+            """Substitute placeholders in one source file."""
+            with open(filepath, "r", encoding="utf-8") as f:
+                content = f.read()
+            content = substitute_version(content, version)
+            # Join multi-line changelog with comment prefix matching file type
+            if filepath.suffix == '.jsfx':
+                changelog_commented = "\n// ".join(changelog.split("\n"))
+            else:
+                changelog_commented = "\n-- ".join(changelog.split("\n"))
+            content = content.replace("{{CHANGELOG}}", changelog_commented)
+            return content.encode("utf-8")
+
+        jobs = []
+        for src_dir, dest_rel in src_dirs:
             if not src_dir.exists():
                 continue
             for filepath in sorted(src_dir.iterdir()):
                 if filepath.is_file():
-                    with open(filepath, "r", encoding="utf-8") as f:
-                        content = f.read()
-                    content = substitute_version(content, version)
-                    # Join multi-line changelog with comment prefix matching file type
-                    if filepath.suffix == '.jsfx':
-                        changelog_commented = "\n// ".join(changelog.split("\n"))
-                    else:
-                        changelog_commented = "\n-- ".join(changelog.split("\n"))
-                    content = content.replace("{{CHANGELOG}}", changelog_commented)
-                    dist_file = dest_dir / filepath.name
-                    with open(dist_file, "w", encoding="utf-8") as f:
-                        f.write(content)
-                    print(f"  ✓ {filepath.name}")
-                    files_processed += 1
-
-        if files_processed == 0:
+                    jobs.append(((dest_rel / filepath.name).as_posix(),
+                                 lambda p=filepath: render_source(p)))
+
+        source_count = len(jobs)
+        if source_count == 0:
             raise ValueError("No source files found in src/")
 
         # Copy LICENSE, README.md, ABOUT.md to dist dir root
         for filename in ["LICENSE", "README.md", "ABOUT.md"]:
             src = REPO_ROOT / filename
-            dst = dist_dir / filename
             if src.exists():
-                shutil.copy2(src, dst)
-                print(f"  ✓ {filename}")
+                jobs.append((filename, lambda p=src: p.read_bytes()))
+
+        # Release notes
+        jobs.append(("RELEASE_NOTES.md", lambda: (
+            f"# ReaTC v{version} Release Notes\n\n{changelog}\n").encode("utf-8")))
+
+        # Independent outputs: render, hash and write in parallel
+        def run_job(job):
+            rel, produce = job
+            return (rel,) + write_if_changed(dist_dir / rel, produce(),
+                                             old_files.get(rel))
+
+        with ThreadPoolExecutor() as pool:
+            results = list(pool.map(run_job, jobs))
+
+        files = {}
+        changed = []
+        for rel, digest, was_written in results:
+            files[rel] = digest
+            if was_written:
+                changed.append(rel)
+                print(f"  ✓ {rel.rsplit('/', 1)[-1]}")
+        skipped = len(results) - len(changed)
+        if skipped:
+            print(f"  = {skipped} unchanged file(s) skipped")
 
-        # Copy images/ to dist for README PDF generation
+        # Generate README.pdf with embedded images (optional — needs pandoc + weasyprint)
+        # Only when README.md or images/ changed since the last successful PDF.
+        inputs = dict(old["inputs"])
         images_src = REPO_ROOT / "images"
-        images_dst = dist_dir / "images"
+        pdf_key = hashlib.sha256(files.get("README.md", "").encode("ascii"))
         if images_src.exists():
-            shutil.copytree(images_src, images_dst,
-                            ignore=shutil.ignore_patterns("*.md"))
-            image_count = len(list(images_dst.iterdir()))
-            print(f"  ✓ images/ ({image_count} files)")
-
-        # Generate README.pdf with embedded images (optional — needs pandoc + weasyprint)
-        if generate_readme_pdf(dist_dir):
-            print(f"  ✓ README.pdf")
-
-        # Remove images/ from dist (only needed for PDF generation)
-        if images_dst.exists():
-            shutil.rmtree(images_dst)
-
-        # Generate release notes
-        notes_file = dist_dir / "RELEASE_NOTES.md"
-        notes_file.write_text(
-            f"# ReaTC v{version} Release Notes\n\n{changelog}\n",
-            encoding="utf-8",
-        )
-        print(f"  ✓ RELEASE_NOTES.md")
+            for image in sorted(images_src.iterdir()):
+                if image.is_file() and image.suffix != ".md":
+                    pdf_key.update(image.name.encode("utf-8"))
+                    pdf_key.update(image.read_bytes())
+        pdf_key = pdf_key.hexdigest()
+        pdf_file = dist_dir / "README.pdf"
+
+        if inputs.get("README.pdf") == pdf_key and pdf_file.exists():
+            files["README.pdf"] = old_files.get("README.pdf") or content_hash(pdf_file.read_bytes())
+        else:
+            # Copy images/ to dist for README PDF generation
+            images_dst = dist_dir / "images"
+            if images_src.exists():
+                shutil.copytree(images_src, images_dst, dirs_exist_ok=True,
+                                ignore=shutil.ignore_patterns("*.md"))
+                image_count = len(list(images_dst.iterdir()))
+                print(f"  ✓ images/ ({image_count} files)")
+
+            if generate_readme_pdf(dist_dir):
+                print(f"  ✓ README.pdf")
+                files["README.pdf"] = content_hash(pdf_file.read_bytes())
+                inputs["README.pdf"] = pdf_key
+                changed.append("README.pdf")
+            else:
+                inputs.pop("README.pdf", None)
+
+            # Remove images/ from dist (only needed for PDF generation)
+            if images_dst.exists():
+                shutil.rmtree(images_dst)
+
+        # Remove outputs whose source no longer exists
+        for rel in sorted(set(old_files) - set(files)):
+            stale = dist_dir / rel
+            if stale.exists():
+                stale.unlink()
+                print(f"  ✗ {rel} (removed)")
+
+        save_manifest(manifest_file, {
+            "version": version,
+            "files": files,
+            "inputs": inputs,
+            "changed": sorted(changed),
+        })
 
         print()
         print(f"✓ Build complete: {dist_dir}")
@@ -217,5 +316,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--version', default='DEV',
                         help='Version string (default: DEV)')
+    parser.add_argument('--clean', action='store_true',
+                        help='Remove dist/ and rebuild everything')
     args = parser.parse_args()
-    sys.exit(build(version=args.version))
+    sys.exit(build(version=args.version, clean=args.clean))
@@ -4,8 +4,15 @@ Verification script for ReaTC build output.
 
 Checks that all expected files exist in dist/ with correct version substitutions.
 Version is passed via --version flag (default: DEV).
+
+By default only the files the last build wrote (the "changed" list in the build
+manifest) are re-read and checked against their recorded hash; unchanged files
+are only checked for presence. Pass --full to re-read and hash every file
+(used for releases, and automatically when no manifest exists).
 """
 
+import hashlib
+import json
 import re
 import sys
 from pathlib import Path
@@ -30,6 +37,15 @@ def parse_env(path):
     return config
 
 
+def load_manifest(dist_dir):
+    """Load the build manifest written by build.py, or None if unavailable."""
+    path = dist_dir.parent / f".manifest-{dist_dir.name}.json"
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
 def verify_badges(config, dist_dir):
     """Check that README.md badges match platforms.env values."""
     readme = REPO_ROOT / "README.md"
@@ -61,9 +77,9 @@ def verify_badges(config, dist_dir):
     return errors
 
 
-def verify(version="DEV"):
-    """Verify build output"""
-    print(f"Verifying ReaTC v{version} build...")
+def verify(version="DEV", full=False):
+    """Verify build output (only changed files unless full=True)"""
+    print(f"Verifying ReaTC v{version} build{' (full)' if full else ''}...")
     print()
 
     # Read ReaPack config for install paths
@@ -90,18 +106,41 @@ def verify(version="DEV"):
         f"{scripts_dir}/reatc_regions_to_ltc.lua": version,
         f"{scripts_dir}/reatc_artnet.py": version,
         f"{scripts_dir}/reatc_osc.py": version,
+        f"{scripts_dir}/reatc_daemon.py": version,
+        f"{scripts_dir}/reatc_profile.py": version,
         f"{scripts_dir}/reatc_ltcgen.py": version,
+        f"{scripts_dir}/reatc_ltcindex.py": version,
         f"{effects_dir}/reatc_tc.jsfx": version,
     }
 
+    manifest = load_manifest(dist_dir)
+    if manifest is None and not full:
+        print("  ⚠ No build manifest — falling back to full verification")
+        full = True
+    recorded = manifest.get("files", {}) if manifest else {}
+    changed = set(recorded) if full else set(manifest.get("changed", []))
+
     missing = []
     version_errors = []
+    hash_errors = []
 
+    # Files recorded by the build must still hold the content it wrote
+    for filename in sorted(changed):
+        filepath = dist_dir / filename
+        if filepath.exists():
+            digest = hashlib.sha256(filepath.read_bytes()).hexdigest()
+            if digest != recorded.get(filename):
+                hash_errors.append(filename)
+                print(f"  ✗ {filename} — content differs from build manifest")
+
+    skipped = 0
     for filename, expected_version in expected_files.items():
         filepath = dist_dir / filename
         if not filepath.exists():
             missing.append(filename)
             print(f"  ✗ {filename} — missing")
+        elif not full and filename in recorded and filename not in changed:
+            skipped += 1
         else:
             print(f"  ✓ {filename}")
 
@@ -116,6 +155,8 @@ def verify(version="DEV"):
                     version_errors.append(filename)
                     print(f"    ↳ ERROR: {{{{VERSION}}}} placeholder not substituted")
 
+    if skipped:
+        print(f"  = {skipped} unchanged file(s) present (use --full to re-check)")
     print()
 
     # Check README badges match platforms.env
@@ -133,6 +174,9 @@ def verify(version="DEV"):
     if missing:
         print(f"✗ Missing {len(missing)} file(s)")
         return 1
+    elif hash_errors:
+        print(f"✗ {len(hash_errors)} file(s) modified since build")
+        return 1
     elif version_errors:
         print(f"✗ Version substitution errors in {len(version_errors)} file(s)")
         return 1
@@ -149,5 +193,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--version', default='DEV',
                         help='Version string (default: DEV)')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-read and hash every file (release mode)')
     args = parser.parse_args()
-    sys.exit(verify(version=args.version))
+    sys.exit(verify(version=args.version, full=args.full))
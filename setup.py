@@ -17,6 +17,7 @@ BUILD_SCRIPTS = [
     REPO_ROOT / "src" / "Scripts" / "ReaTC" / "reatc_artnet.py",
     REPO_ROOT / "src" / "Scripts" / "ReaTC" / "reatc_osc.py",
     REPO_ROOT / "src" / "Scripts" / "ReaTC" / "reatc_ltcgen.py",
+    REPO_ROOT / "src" / "Scripts" / "ReaTC" / "reatc_ltcindex.py",
 ]
 
 def setup():
@@ -118,6 +118,9 @@ local function loop()
   outputs.send_artnet()
   outputs.send_osc()
 
+  -- Read daemon health files (rate-limited internally)
+  outputs.poll_health()
+
   reaper.defer(loop)
 end
 
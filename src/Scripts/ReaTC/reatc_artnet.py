@@ -5,7 +5,11 @@
 # Art-Net TimeCode UDP Daemon
 # Persistent process that reads timecode from stdin and sends Art-Net packets.
 #
-# Usage: python3 reatc_artnet.py <dest_ip>
+# Usage: python3 reatc_artnet.py <dest_ip> [options]
+#
+# The options (health status file, profiling, socket QoS, low-jitter mode and
+# multi-producer listen mode) are shared with the other daemon and documented
+# in reatc_daemon.py and reatc_profile.py; --help lists them all.
 #
 # Stdin protocol (one line per packet, space-separated integers):
 #   <hours> <mins> <secs> <frames> <tc_type>
@@ -31,12 +35,19 @@ from __future__ import annotations
 
 __version__ = "{{VERSION}}"
 
+import argparse
 import socket
 import struct
 import sys
+from time import perf_counter_ns
+
+from reatc_daemon import DaemonSession, add_daemon_args, freeze_gc, tc_in_range
 
 ARTNET_PORT = 6454
 
+# Timecode fields (frames, secs, mins, hours, type) at offset 14 of the packet
+_TC_FIELDS = struct.Struct("<5B")
+
 
 def build_artnet_timecode(hours: int, mins: int, secs: int, frames: int, tc_type: int) -> bytes:
     """Build Art-Net TimeCode packet (19 bytes).
@@ -76,19 +87,30 @@ def build_artnet_timecode(hours: int, mins: int, secs: int, frames: int, tc_type
 
 def main() -> None:
     """Entry point: read timecode lines from stdin and send Art-Net UDP packets."""
-    if len(sys.argv) < 2:
-        print("Usage: reatc_artnet.py <dest_ip>", file=sys.stderr)
-        sys.exit(1)
+    parser = argparse.ArgumentParser(prog="reatc_artnet.py")
+    parser.add_argument("dest_ip")
+    add_daemon_args(parser)
+    args = parser.parse_args()
+
+    dest_ip = args.dest_ip
 
-    dest_ip = sys.argv[1]
+    # Packet buffer and destination are allocated once; the loop patches the
+    # timecode bytes in place
+    packet = bytearray(build_artnet_timecode(0, 0, 0, 0, 0))
+    dest = (dest_ip, ARTNET_PORT)
 
     # Create socket once at startup (avoid per-packet overhead)
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    session = DaemonSession("artnet", parser, args, sock)
+    stats = session.stats
+    freeze_after = session.freeze_after
+    jitter = stats.jitter
 
     try:
-        # Read lines from stdin until EOF
-        for line in sys.stdin:
+        # Read lines until EOF on stdin (or until signalled in listen mode)
+        for line in session.source:
+            t_read = stats.last_read_ns = perf_counter_ns()
             line = line.strip()
             if not line:
                 continue
@@ -96,6 +118,7 @@ def main() -> None:
             try:
                 parts = line.split()
                 if len(parts) < 5:
+                    stats.parse_failed(f"malformed line: {line!r}")
                     print(f"artnet: malformed line (need 5 fields): {line!r}", file=sys.stderr)
                     continue
 
@@ -105,16 +128,24 @@ def main() -> None:
                 frames = int(parts[3])
                 tc_type = int(parts[4])
 
-                if not (0 <= hours <= 39 and 0 <= mins <= 59
-                        and 0 <= secs <= 59 and 0 <= frames <= 29
-                        and 0 <= tc_type <= 3):
+                if not tc_in_range(hours, mins, secs, frames, tc_type):
+                    stats.parse_failed(f"TC out of range: {line!r}")
                     print(f"artnet: TC out of range: {line!r}", file=sys.stderr)
                     continue
 
-                packet = build_artnet_timecode(hours, mins, secs, frames, tc_type)
-                sock.sendto(packet, (dest_ip, ARTNET_PORT))
+                _TC_FIELDS.pack_into(packet, 14, frames, secs, mins, hours, tc_type)
+                try:
+                    sock.sendto(packet, dest)
+                    stats.packets_sent += 1
+                    jitter.tick(t_read, perf_counter_ns())
+                    if stats.packets_sent == freeze_after:
+                        stats.realtime["gc"] = freeze_gc()
+                except OSError as e:
+                    # Stay alive on transient network errors; reported via --status
+                    stats.send_failed(e)
 
             except (ValueError, IndexError):
+                stats.parse_failed(f"parse error: {line!r}")
                 print(f"artnet: parse error: {line!r}", file=sys.stderr)
                 continue
 
@@ -124,6 +155,7 @@ def main() -> None:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
     finally:
+        session.close()
         sock.close()
 
 
@@ -24,6 +24,10 @@ M.FR_NAMES = { "24fps (Film)", "25fps (EBU)", "29.97DF", "30fps (SMPTE)" }
 M.FPS_VAL  = { 24, 25, 29.97, 30 }  -- index 1..4
 M.FPS_INT  = { 24, 25, 30,    30 }  -- integer frame count
 
+-- Traffic class for daemon packets, passed as --dscp ("" = OS default)
+M.DSCP_CLASSES = { "", "EF", "CS6", "CS5", "AF41" }
+M.DSCP_NAMES   = { "Default", "EF (expedited)", "CS6", "CS5", "AF41" }
+
 M.PYTHON_CANDIDATES = {
   "python3", "python",
   "/usr/bin/python3",
@@ -50,6 +54,17 @@ M.py_osc    = M.script_path .. "reatc_osc.py"
 M.is_win = reaper.GetOS():find("Win") ~= nil
 M.dev_null = M.is_win and "2>NUL" or "2>/dev/null"
 
+-- Daemon health files (see reatc_daemon.py); unique per REAPER session
+do
+  local tmp = M.is_win and (os.getenv("TEMP") or os.getenv("TMP") or ".")
+                       or (os.getenv("TMPDIR") or "/tmp")
+  local sep = M.is_win and "\\" or "/"
+  local tag = string.format("%x", math.floor(reaper.time_precise() * 1000) % 0x7fffffff)
+  tmp = tmp:gsub("[\\/]$", "")
+  M.artnet_status_path = tmp .. sep .. "reatc_artnet_" .. tag .. ".status"
+  M.osc_status_path    = tmp .. sep .. "reatc_osc_" .. tag .. ".status"
+end
+
 -- Source IDs (matching JSFX active_source values)
 M.SRC_NONE     = 0
 M.SRC_LTC      = 1
@@ -99,6 +114,14 @@ M.state = {
   last_osc_time    = 0,
   osc_packets_sent = 0,
 
+  -- Network (shared by both daemons)
+  net_dscp         = "",
+  net_realtime     = false,  -- daemons run with --realtime (low-jitter mode)
+
+  -- Daemon health (parsed from status files; nil until first read)
+  artnet_health    = nil,
+  osc_health       = nil,
+
   -- Active TC (read from gmem, written by JSFX)
   tc_h = 0, tc_m = 0, tc_s = 0, tc_f = 0,
   tc_valid       = false,
@@ -229,6 +252,8 @@ local SK = {
   OSC_IP            = "osc_ip",
   OSC_PORT          = "osc_port",
   OSC_ADDRESS       = "osc_address",
+  NET_DSCP          = "net_dscp",
+  NET_REALTIME      = "net_realtime",
   TC_OFFSET_H       = "tc_offset_h",
   TC_OFFSET_M       = "tc_offset_m",
   TC_OFFSET_S       = "tc_offset_s",
@@ -252,6 +277,12 @@ function M.load_settings()
   s.osc_ip         = (loaded_osc_ip and M.is_valid_ipv4(loaded_osc_ip)) and loaded_osc_ip or s.osc_ip
   s.osc_port       = tonumber(gets(SK.OSC_PORT)) or 9000
   s.osc_address    = gets(SK.OSC_ADDRESS) or "/tc"
+  local loaded_dscp = gets(SK.NET_DSCP) or ""
+  s.net_dscp       = ""
+  for _, class in ipairs(M.DSCP_CLASSES) do
+    if class == loaded_dscp then s.net_dscp = class end
+  end
+  s.net_realtime   = gets(SK.NET_REALTIME) == "true"
   s.tc_offset_h        = tonumber(gets(SK.TC_OFFSET_H)) or 0
   s.tc_offset_m        = tonumber(gets(SK.TC_OFFSET_M)) or 0
   s.tc_offset_s        = tonumber(gets(SK.TC_OFFSET_S)) or 0
@@ -278,6 +309,8 @@ function M.save_settings()
   sets(SK.OSC_IP,            s.osc_ip)
   sets(SK.OSC_PORT,          s.osc_port)
   sets(SK.OSC_ADDRESS,       s.osc_address)
+  sets(SK.NET_DSCP,          s.net_dscp)
+  sets(SK.NET_REALTIME,      s.net_realtime)
   sets(SK.TC_OFFSET_H,       s.tc_offset_h)
   sets(SK.TC_OFFSET_M,       s.tc_offset_m)
   sets(SK.TC_OFFSET_S,       s.tc_offset_s)
@@ -0,0 +1,892 @@
+#!/usr/bin/env python3
+# ReaTC — https://github.com/paskateknikko/ReaTC
+# Copyright (c) 2025 Tuukka Aimasmäki. MIT License — see LICENSE.
+#
+# Shared helpers for the output daemons (reatc_artnet.py, reatc_osc.py).
+# Standard library only.
+#
+# Each daemon parses its own destination arguments, then takes every option
+# below from add_daemon_args() and starts up through DaemonSession; profiling
+# (--profile, --profile-dir) is documented in reatc_profile.py.
+#
+# Health back-channel (add_status_args): with --status <path> a daemon
+# rewrites a small "key=value" text file every --status-interval seconds
+# (default 1; atomically, via rename) so reatc_outputs.lua can show real
+# health without touching the send path:
+#
+#   pid=12345
+#   heartbeat=1760000000.123   (time.time() of this write)
+#   seq=42                     (increments every write)
+#   packets_sent=1234
+#   send_errors=0
+#   parse_errors=0
+#   last_error=                (most recent send/parse error, or empty)
+#   queue_depth=0              (bytes waiting in the stdin pipe, -1 if unknown)
+#   cpu_s=0.412                (process CPU time, from time.process_time())
+#   progress_age=0.033         (s since the send loop last took a line; with
+#                               queue_depth > 0 a growing age means a stall)
+#   sock_dscp=46               (one sock_<option>= line per socket option given,
+#   sock_sndbuf=131072          holding the value read back from the socket)
+#   ipi_mean_us=33367          (interval between sent packets: mean, standard
+#   ipi_jitter_us=412           deviation, 99th percentile and maximum, µs)
+#   ipi_p99_us=34200
+#   ipi_max_us=35120
+#   lat_mean_us=18             (stdin line read → sendto() returned: mean, max)
+#   lat_max_us=95
+#   rt_sched=fifo:10           (with --realtime: scheduling actually obtained,
+#   rt_affinity=2               CPU affinity, and GC state after warm-up)
+#   rt_gc=frozen:18432
+#   listen_active=foh          (with --listen: producer currently on air, the
+#   listen_producers=foh:10,b:0 live producers with their priorities, how often
+#   listen_switches=1           the output changed hands, records dropped
+#   listen_shadowed=250         because another producer held the output, and
+#   listen_rejected=0           records from new producers dropped because
+#                               MAX_PRODUCERS live producers were known)
+#
+# Socket options (add_socket_args / apply_socket_options), for converged show
+# networks where timecode must not queue behind video:
+#
+#   --dscp CLASS       IP_TOS traffic class: EF, CSn, AFxy, VA or 0-63
+#   --sndbuf BYTES     SO_SNDBUF (Linux reports double the request)
+#   --ttl N            IP_MULTICAST_TTL for multicast destinations
+#   --multicast-if IP  IP_MULTICAST_IF: local interface address for multicast
+#   --bind IP[:PORT]   source address (and port) to send from
+#
+# Each option is read back with getsockopt/getsockname after it is set; a
+# refused or altered option is reported on stderr and in last_error, and the
+# daemon keeps sending with whatever the OS allowed.
+#
+# Low-jitter mode (add_realtime_args / apply_realtime):
+#
+#   --realtime         SCHED_FIFO, else a negative nice value (Linux/macOS; falls
+#                      back to the default policy without privileges), and after
+#                      WARMUP_PACKETS sends: gc.collect(), gc.freeze(), gc.disable()
+#   --cpu LIST         with --realtime, pin to these CPUs (Linux), e.g. 2 or 2,3
+#
+# Listen mode (add_listen_args / Listener): instead of stdin, take records
+# from several producers over a local datagram socket, one record per line:
+#
+#   <hours> <mins> <secs> <frames> <tc_type> [<producer> [<priority>]]
+#
+#   --listen ADDR      udp:HOST:PORT, HOST:PORT, PORT (127.0.0.1) or unix:PATH
+#   --priority NAME=N  override a producer's priority (repeatable)
+#   --failover SEC     silence after which the producer on air loses the output
+#
+# The live producer with the highest priority is on air; on a tie the one
+# already on air keeps it.  A producer that goes quiet for --failover seconds
+# hands over on the next record from anyone else.  Only well-formed, in-range
+# records take part, so a producer sending garbage is not live and cannot hold
+# the output.  Records without a producer name are keyed by UDP sender address
+# at priority 0; on a Unix socket the name is required, since unbound senders
+# have no address.  The daemon runs until SIGINT/SIGTERM.
+#
+# @noindex
+# @version {{VERSION}}
+
+from __future__ import annotations
+
+__version__ = "{{VERSION}}"
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import stat
+import sys
+import threading
+import time
+
+from reatc_profile import add_profile_args, start_profiling
+
+# Seconds between status file rewrites
+STATUS_INTERVAL = 1.0
+
+# DSCP code points by name (RFC 2474 / 2597 / 3246 / 5865); IP_TOS is DSCP << 2
+DSCP_NAMES = {f"CS{n}": 8 * n for n in range(8)}
+DSCP_NAMES.update({f"AF{c}{d}": 8 * c + 2 * d for c in range(1, 5) for d in range(1, 4)})
+DSCP_NAMES.update({"EF": 46, "VA": 44})
+
+# --realtime: SCHED_FIFO priority, fallback nice value, sends before freezing GC
+RT_PRIORITY = 10
+RT_NICE = -10
+WARMUP_PACKETS = 100
+
+# --listen: default quiet time before failover, and producer table bound
+FAILOVER_TIMEOUT = 0.5
+MAX_PRODUCERS = 64
+
+# Inter-packet interval histogram, log-linear: 1 µs bins below 128 µs, then 64
+# bins per doubling (each under 1/64 of its value wide) up to IPI_MAX_US; the
+# last bin is overflow
+IPI_SUB_BITS = 6
+IPI_MAX_US = 1 << 21
+
+
+def ipi_bin(us: int) -> int:
+    """Return the histogram bin of an interval.
+
+    @param us: Interval in microseconds, below IPI_MAX_US.
+    @return: Bin index; bins grow with the interval (see IPI_SUB_BITS).
+    """
+    if us < 2 << IPI_SUB_BITS:
+        return us
+    shift = us.bit_length() - IPI_SUB_BITS - 1
+    return (shift << IPI_SUB_BITS) + (us >> shift)
+
+
+def ipi_bin_upper_us(index: int) -> int:
+    """Return the exclusive upper edge of a histogram bin in microseconds."""
+    if index < 2 << IPI_SUB_BITS:
+        return index + 1
+    shift = (index >> IPI_SUB_BITS) - 1
+    return ((index & ((1 << IPI_SUB_BITS) - 1)) + (1 << IPI_SUB_BITS) + 1) << shift
+
+
+IPI_BINS = ipi_bin(IPI_MAX_US - 1) + 2
+
+
+class JitterMeter:
+    """Inter-packet interval and read-to-send latency, updated on every send.
+
+    Only integer arithmetic and one preallocated histogram on the send path;
+    percentiles are computed when the status file is written, walking down
+    from the largest interval so p99 costs a few bins rather than all of them.
+    """
+
+    __slots__ = ("count", "last_ns", "sum_ns", "sumsq_us", "max_ns",
+                 "lat_count", "lat_sum_ns", "lat_max_ns", "bins")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last_ns = 0
+        self.sum_ns = 0
+        self.sumsq_us = 0
+        self.max_ns = 0
+        self.lat_count = 0
+        self.lat_sum_ns = 0
+        self.lat_max_ns = 0
+        self.bins = [0] * IPI_BINS
+
+    def tick(self, read_ns: int, sent_ns: int) -> None:
+        """Record one sent packet.
+
+        @param read_ns: time.perf_counter_ns() when its stdin line was read.
+        @param sent_ns: time.perf_counter_ns() after sendto() returned.
+        """
+        lat = sent_ns - read_ns
+        self.lat_count += 1
+        self.lat_sum_ns += lat
+        if lat > self.lat_max_ns:
+            self.lat_max_ns = lat
+        if self.last_ns:
+            ipi = sent_ns - self.last_ns
+            us = ipi // 1000
+            self.count += 1
+            self.sum_ns += ipi
+            self.sumsq_us += us * us
+            if ipi > self.max_ns:
+                self.max_ns = ipi
+            self.bins[ipi_bin(us) if us < IPI_MAX_US else IPI_BINS - 1] += 1
+        self.last_ns = sent_ns
+
+    def percentile_us(self, fraction: float) -> int:
+        """Return the interval below which `fraction` of intervals fall (bin upper edge)."""
+        if not self.count:
+            return 0
+        bins = self.bins
+        allowed = self.count - fraction * self.count   # intervals that may lie above
+        max_us = self.max_ns // 1000
+        i = ipi_bin(max_us) if max_us < IPI_MAX_US else IPI_BINS - 1
+        above = 0
+        while i > 0 and above + bins[i] <= allowed:
+            above += bins[i]
+            i -= 1
+        return ipi_bin_upper_us(i)
+
+    def summary(self) -> dict[str, int]:
+        """Return interval and latency statistics in microseconds."""
+        n = self.count
+        mean = self.sum_ns / n / 1000 if n else 0.0
+        var = self.sumsq_us / n - mean * mean if n else 0.0
+        return {
+            "ipi_mean_us": round(mean),
+            "ipi_jitter_us": round(max(var, 0.0) ** 0.5),
+            "ipi_p99_us": self.percentile_us(0.99),
+            "ipi_max_us": self.max_ns // 1000,
+            "lat_mean_us": self.lat_sum_ns // self.lat_count // 1000 if self.lat_count else 0,
+            "lat_max_us": self.lat_max_ns // 1000,
+        }
+
+
+def tc_in_range(hours: int, mins: int, secs: int, frames: int, tc_type: int) -> bool:
+    """Return True if a record's fields are within what the daemons send."""
+    return (0 <= hours <= 39 and 0 <= mins <= 59 and 0 <= secs <= 59
+            and 0 <= frames <= 29 and 0 <= tc_type <= 3)
+
+
+class DaemonStats:
+    """Counters updated by a daemon's main loop and read by the status writer."""
+
+    __slots__ = ("packets_sent", "send_errors", "parse_errors", "last_error",
+                 "last_read_ns", "socket_options", "realtime", "jitter", "arbiter")
+
+    def __init__(self) -> None:
+        self.packets_sent = 0
+        self.send_errors = 0
+        self.parse_errors = 0
+        self.last_error = ""
+        self.last_read_ns = time.perf_counter_ns()   # stamped by the send loop
+        self.socket_options: dict[str, str] = {}
+        self.realtime: dict[str, str] = {}
+        self.jitter = JitterMeter()
+        self.arbiter: Arbiter | None = None
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the numeric counters (for profiling reports)."""
+        return {
+            "packets_sent": self.packets_sent,
+            "send_errors": self.send_errors,
+            "parse_errors": self.parse_errors,
+        }
+
+    def send_failed(self, exc: OSError) -> None:
+        """Record a failed sendto() (unreachable host, ENOBUFS, ...)."""
+        self.send_errors += 1
+        self.last_error = f"send: {exc}"
+
+    def parse_failed(self, message: str) -> None:
+        """Record a rejected stdin line."""
+        self.parse_errors += 1
+        self.last_error = message
+
+
+def stdin_queue_depth() -> int:
+    """Return the number of bytes waiting in the stdin pipe, or -1 if unknown.
+
+    Uses FIONREAD, which is available on macOS and Linux but not Windows.
+    """
+    try:
+        import array
+        import fcntl
+        import termios
+        buf = array.array("i", [0])
+        fcntl.ioctl(sys.stdin.fileno(), termios.FIONREAD, buf, True)
+        return buf[0]
+    except (ImportError, OSError, ValueError, AttributeError):
+        return -1
+
+
+def format_status(stats: DaemonStats, seq: int, queue_depth: int) -> str:
+    """Render the status file body.
+
+    @param stats: Current daemon counters.
+    @param seq: Write sequence number.
+    @param queue_depth: Bytes pending on stdin (-1 if unknown).
+    @return: "key=value" lines, newline-terminated.
+    """
+    last_error = stats.last_error.replace("\n", " ").replace("\r", " ")
+    return (
+        f"pid={os.getpid()}\n"
+        f"heartbeat={time.time():.3f}\n"
+        f"seq={seq}\n"
+        f"packets_sent={stats.packets_sent}\n"
+        f"send_errors={stats.send_errors}\n"
+        f"parse_errors={stats.parse_errors}\n"
+        f"last_error={last_error}\n"
+        f"queue_depth={queue_depth}\n"
+        f"cpu_s={time.process_time():.6f}\n"
+        f"progress_age={(time.perf_counter_ns() - stats.last_read_ns) / 1e9:.3f}\n"
+        + "".join(f"sock_{key}={value}\n" for key, value in stats.socket_options.items())
+        + "".join(f"{key}={value}\n" for key, value in stats.jitter.summary().items())
+        + "".join(f"rt_{key}={value}\n" for key, value in stats.realtime.items())
+        + ("".join(f"listen_{key}={value}\n" for key, value in stats.arbiter.status().items())
+           if stats.arbiter else "")
+    )
+
+
+class StatusWriter(threading.Thread):
+    """Background thread that rewrites the status file at a low rate.
+
+    Runs off the send path, so the heartbeat keeps ticking whatever the main
+    loop is doing: it only shows that the process is alive.  A blocked or
+    deadlocked send loop shows up as a growing progress_age while bytes wait
+    in queue_depth.
+    """
+
+    def __init__(self, path: str, stats: DaemonStats, interval: float = STATUS_INTERVAL) -> None:
+        """Create (but do not start) a status writer.
+
+        @param path: Status file path; a sibling "<path>.tmp" is used for renames.
+        @param stats: Counters to publish.
+        @param interval: Seconds between writes.
+        """
+        super().__init__(name="reatc-status", daemon=True)
+        self.path = path
+        self.stats = stats
+        self.interval = interval
+        self.seq = 0
+        self._stop_event = threading.Event()
+
+    def write(self) -> None:
+        """Write the status file once (atomic replace; errors are ignored)."""
+        self.seq += 1
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as fh:
+                fh.write(format_status(self.stats, self.seq, stdin_queue_depth()))
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # e.g. reader holds the file open on Windows — retry next tick
+        except Exception as e:
+            # Never let one bad write end the heartbeat: the UI would call a
+            # working daemon dead
+            self.stats.last_error = f"status: {e!r}"
+
+    def run(self) -> None:
+        """Write immediately, then every interval until stopped."""
+        self.write()
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def stop(self) -> None:
+        """Stop the thread and publish the final counters."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=self.interval + 1.0)
+        self.write()
+
+
+def add_status_args(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --status/--status-interval options."""
+    group = parser.add_argument_group("health status")
+    group.add_argument("--status", metavar="PATH",
+                       help="health status file, rewritten about once a second")
+    group.add_argument("--status-interval", type=float, default=STATUS_INTERVAL, metavar="SEC",
+                       help=f"seconds between status file writes (default {STATUS_INTERVAL})")
+
+
+# ── Socket options ───────────────────────────────────────────────────────────
+
+def parse_dscp(value: str) -> int:
+    """Parse a DSCP class name (EF, CS5, AF41, ...) or number (0-63).
+
+    @param value: Class name (case-insensitive) or decimal/hex code point.
+    @return: DSCP code point.
+    @raise argparse.ArgumentTypeError: On an unknown name or out-of-range number.
+    """
+    name = value.strip().upper()
+    if name in DSCP_NAMES:
+        return DSCP_NAMES[name]
+    try:
+        dscp = int(name, 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"unknown DSCP class {value!r}") from None
+    if not 0 <= dscp <= 63:
+        raise argparse.ArgumentTypeError(f"DSCP must be 0-63, got {dscp}")
+    return dscp
+
+
+def parse_bind(value: str) -> tuple[str, int]:
+    """Parse "IP" or "IP:PORT" into a (host, port) tuple (port 0 = any).
+
+    @raise argparse.ArgumentTypeError: On a malformed address or port.
+    """
+    host, _, port = value.rpartition(":") if ":" in value else (value, "", "0")
+    try:
+        socket.inet_aton(host)
+        port_num = int(port)
+    except (OSError, ValueError):
+        raise argparse.ArgumentTypeError(f"bind address must be IP[:PORT], got {value!r}") from None
+    if not 0 <= port_num <= 65535:
+        raise argparse.ArgumentTypeError(f"port must be 0-65535, got {port_num}")
+    return host, port_num
+
+
+def _ipv4(value: str) -> str:
+    """argparse type: a dotted IPv4 address."""
+    try:
+        socket.inet_aton(value)
+    except OSError:
+        raise argparse.ArgumentTypeError(f"not an IPv4 address: {value!r}") from None
+    return value
+
+
+def _positive_int(value: str) -> int:
+    """argparse type: an integer >= 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be >= 1, got {number}")
+    return number
+
+
+def add_socket_args(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --dscp/--sndbuf/--ttl/--multicast-if/--bind options."""
+    group = parser.add_argument_group("socket options")
+    group.add_argument("--dscp", type=parse_dscp, metavar="CLASS",
+                       help="IP traffic class: EF, CS5, AF41, ... or 0-63")
+    group.add_argument("--sndbuf", type=_positive_int, metavar="BYTES",
+                       help="socket send buffer size (SO_SNDBUF)")
+    group.add_argument("--ttl", type=int, choices=range(1, 256), metavar="N",
+                       help="multicast TTL (1-255)")
+    group.add_argument("--multicast-if", type=_ipv4, metavar="IP",
+                       help="local interface address for multicast sends")
+    group.add_argument("--bind", type=parse_bind, metavar="IP[:PORT]",
+                       help="source address (and port) to send from")
+
+
+def configure_socket(sock: socket.socket, dscp: int | None = None, sndbuf: int | None = None,
+                     ttl: int | None = None, multicast_if: str | None = None,
+                     bind: tuple[str, int] | None = None) -> tuple[dict[str, str], list[str]]:
+    """Apply socket options and read each one back.
+
+    @param sock: IPv4 UDP socket, not yet used for sending.
+    @param dscp: DSCP code point for IP_TOS.
+    @param sndbuf: SO_SNDBUF request in bytes.
+    @param ttl: IP_MULTICAST_TTL.
+    @param multicast_if: IPv4 address of the multicast interface.
+    @param bind: (host, port) source address.
+    @return: Tuple of (applied, problems): the value read back per option
+             given ("failed" if setting it raised) and a message for every
+             option that was refused or altered.
+    """
+    applied: dict[str, str] = {}
+    problems: list[str] = []
+
+    def check(key, requested, setter, getter, ok=lambda got, want: got == want):
+        try:
+            setter()
+            got = getter()
+        except (OSError, AttributeError) as e:
+            applied[key] = "failed"
+            problems.append(f"{key} {requested}: {e}")
+            return
+        applied[key] = str(got)
+        if not ok(got, requested):
+            problems.append(f"{key}: requested {requested}, socket reports {got}")
+
+    if bind is not None:
+        check("bind", f"{bind[0]}:{bind[1]}",
+              lambda: sock.bind(bind),
+              lambda: "{}:{}".format(*sock.getsockname()),
+              lambda got, want: got.split(":")[0] == want.split(":")[0]
+              and (want.endswith(":0") or got == want))
+    if dscp is not None:
+        check("dscp", dscp,
+              lambda: sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, dscp << 2),
+              lambda: sock.getsockopt(socket.IPPROTO_IP, socket.IP_TOS) >> 2)
+    if sndbuf is not None:
+        check("sndbuf", sndbuf,
+              lambda: sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf),
+              lambda: sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF),
+              lambda got, want: got >= want)
+    if ttl is not None:
+        def set_ttl():
+            try:
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, ttl)
+            except OSError:     # BSD/macOS want a single byte
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, bytes([ttl]))
+        check("ttl", ttl, set_ttl,
+              lambda: sock.getsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)[0])
+    if multicast_if is not None:
+        check("multicast_if", multicast_if,
+              lambda: sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                                      socket.inet_aton(multicast_if)),
+              lambda: socket.inet_ntoa(
+                  sock.getsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, 4)))
+    return applied, problems
+
+
+def apply_socket_options(sock: socket.socket, args: argparse.Namespace,
+                         stats: DaemonStats, prog: str) -> None:
+    """Apply add_socket_args() options, record them in stats and warn on problems.
+
+    @param sock: The daemon's UDP socket.
+    @param args: Parsed arguments including the socket options.
+    @param stats: Counters; socket_options and last_error are updated.
+    @param prog: Prefix for stderr messages (e.g. "artnet").
+    """
+    applied, problems = configure_socket(sock, args.dscp, args.sndbuf, args.ttl,
+                                         args.multicast_if, args.bind)
+    stats.socket_options = applied
+    for problem in problems:
+        stats.last_error = f"socket: {problem}"
+        print(f"{prog}: socket option {problem}", file=sys.stderr)
+
+
+# ── Low-jitter mode ──────────────────────────────────────────────────────────
+
+def parse_cpus(value: str) -> set[int]:
+    """Parse a CPU list such as "2" or "2,3".
+
+    @raise argparse.ArgumentTypeError: On a malformed or negative entry.
+    """
+    try:
+        cpus = {int(part) for part in value.split(",") if part.strip()}
+    except ValueError:
+        cpus = set()
+    if not cpus or min(cpus) < 0:
+        raise argparse.ArgumentTypeError(f"CPU list must be like 2 or 2,3, got {value!r}")
+    return cpus
+
+
+def add_realtime_args(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --realtime/--cpu options."""
+    group = parser.add_argument_group("low-jitter mode")
+    group.add_argument("--realtime", action="store_true",
+                       help="raise scheduling priority and freeze GC after warm-up")
+    group.add_argument("--cpu", type=parse_cpus, metavar="LIST",
+                       help="with --realtime, pin to these CPUs (Linux), e.g. 2 or 2,3")
+
+
+def enable_realtime(cpus: set[int] | None = None) -> tuple[dict[str, str], list[str]]:
+    """Raise the calling thread's scheduling priority and optionally pin it.
+
+    Tries SCHED_FIFO, then a negative nice value; each step is read back, and
+    a missing privilege just leaves the default policy in place.
+
+    @param cpus: CPUs to pin to, or None to leave affinity alone.
+    @return: Tuple of (report, problems): what was obtained ("sched",
+             "affinity") and a message for every step that was refused.
+    """
+    report: dict[str, str] = {}
+    problems: list[str] = []
+    if hasattr(os, "sched_setscheduler"):
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(RT_PRIORITY))
+            if os.sched_getscheduler(0) == os.SCHED_FIFO:
+                report["sched"] = f"fifo:{os.sched_getparam(0).sched_priority}"
+        except OSError as e:
+            problems.append(f"SCHED_FIFO: {e}")
+    if "sched" not in report and hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, 0, RT_NICE)
+            report["sched"] = f"nice:{os.getpriority(os.PRIO_PROCESS, 0)}"
+        except OSError as e:
+            problems.append(f"nice {RT_NICE}: {e}")
+    report.setdefault("sched", "default")
+
+    if cpus:
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, cpus)
+                report["affinity"] = ",".join(str(c) for c in sorted(os.sched_getaffinity(0)))
+            except OSError as e:
+                problems.append(f"CPU affinity {sorted(cpus)}: {e}")
+        else:
+            problems.append("CPU affinity: not supported on this platform")
+    return report, problems
+
+
+def freeze_gc() -> str:
+    """Collect once, move every live object out of GC tracking and stop cyclic GC.
+
+    Called after warm-up, when imports, caches and hot-path buffers exist;
+    the send loop creates no reference cycles, so refcounting frees the rest.
+
+    @return: Status text, e.g. "frozen:18432" (objects frozen).
+    """
+    gc.collect()
+    gc.disable()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+        return f"frozen:{gc.get_freeze_count()}"
+    return "disabled"
+
+
+def apply_realtime(args: argparse.Namespace, stats: DaemonStats, prog: str) -> int:
+    """Apply add_realtime_args() options and record the result in stats.
+
+    @param args: Parsed arguments including --realtime/--cpu.
+    @param stats: Counters; realtime is updated.
+    @param prog: Prefix for stderr messages (e.g. "artnet").
+    @return: Packet count after which to call freeze_gc(), or -1 when off.
+    """
+    if not args.realtime:
+        if args.cpu:
+            print(f"{prog}: --cpu needs --realtime, ignored", file=sys.stderr)
+        return -1
+    report, problems = enable_realtime(args.cpu)
+    report["gc"] = "warming"
+    stats.realtime = report
+    for problem in problems:
+        print(f"{prog}: realtime: {problem}", file=sys.stderr)
+    return WARMUP_PACKETS
+
+
+# ── Listen mode ──────────────────────────────────────────────────────────────
+
+def parse_listen(value: str) -> tuple[int, object]:
+    """Parse a --listen address.
+
+    @param value: "unix:PATH", "udp:HOST:PORT", "HOST:PORT" or "PORT".
+    @return: Tuple of (address family, bind address).
+    @raise argparse.ArgumentTypeError: On a malformed address.
+    """
+    if value.startswith("unix:"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise argparse.ArgumentTypeError("unix: sockets are not supported on this platform")
+        path = value[5:]
+        if not path:
+            raise argparse.ArgumentTypeError("unix: needs a socket path")
+        return socket.AF_UNIX, path
+    spec = value[4:] if value.startswith("udp:") else value
+    host, _, port = spec.rpartition(":")
+    try:
+        host = host or "127.0.0.1"
+        socket.inet_aton(host)
+        port_num = int(port)
+    except (OSError, ValueError):
+        raise argparse.ArgumentTypeError(
+            f"listen address must be udp:HOST:PORT or unix:PATH, got {value!r}") from None
+    if not 1 <= port_num <= 65535:
+        raise argparse.ArgumentTypeError(f"port must be 1-65535, got {port_num}")
+    return socket.AF_INET, (host, port_num)
+
+
+def parse_priority(value: str) -> tuple[str, int]:
+    """Parse a --priority NAME=N override.
+
+    @raise argparse.ArgumentTypeError: On a malformed override.
+    """
+    name, _, number = value.partition("=")
+    try:
+        return name, int(number)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"priority must be NAME=N, got {value!r}") from None
+
+
+def add_listen_args(parser: argparse.ArgumentParser) -> None:
+    """Add the shared --listen/--priority/--failover options."""
+    group = parser.add_argument_group("listen mode")
+    group.add_argument("--listen", type=parse_listen, metavar="ADDR",
+                       help="take records from producers on udp:HOST:PORT or unix:PATH"
+                            " instead of stdin")
+    group.add_argument("--priority", type=parse_priority, action="append", default=[],
+                       metavar="NAME=N", help="override a producer's priority (repeatable)")
+    group.add_argument("--failover", type=float, default=FAILOVER_TIMEOUT, metavar="SEC",
+                       help=f"quiet time before the next producer takes over"
+                            f" (default {FAILOVER_TIMEOUT})")
+
+
+class Producer:
+    """One source of TC records in listen mode."""
+
+    __slots__ = ("name", "priority", "last_seen", "records")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.priority = 0
+        self.last_seen = 0.0
+        self.records = 0
+
+
+class Arbiter:
+    """Decides which producer's records reach the network.
+
+    The live producer with the highest priority wins; on a tie the producer
+    on air keeps it, so equal producers never flap.  Failover needs no timer:
+    the next record from anyone checks whether the producer on air went quiet.
+    """
+
+    def __init__(self, overrides: dict[str, int] | None = None,
+                 timeout: float = FAILOVER_TIMEOUT) -> None:
+        """Create an arbiter.
+
+        @param overrides: Producer name → priority, replacing what it sends.
+        @param timeout: Seconds of silence after which a producer is not live.
+        """
+        self.overrides = overrides or {}
+        self.timeout = timeout
+        self.producers: dict[str, Producer] = {}
+        self._lock = threading.Lock()   # table changes vs status() snapshots
+        self.active: Producer | None = None
+        self.switches = 0
+        self.shadowed = 0
+        self.rejected = 0
+
+    def offer(self, name: str, priority: int, now: float) -> bool:
+        """Register a record from a producer.
+
+        @param name: Producer name.
+        @param priority: Priority the producer declared.
+        @param now: time.monotonic() at receipt.
+        @return: True if the record should be sent.
+        """
+        producer = self.producers.get(name)
+        if producer is None:
+            with self._lock:
+                if len(self.producers) >= MAX_PRODUCERS:
+                    self._prune(now)
+                    if len(self.producers) >= MAX_PRODUCERS:
+                        # All live: keep them rather than let new names push them out
+                        self.rejected += 1
+                        return False
+                producer = self.producers[name] = Producer(name)
+        producer.priority = self.overrides.get(name, priority)
+        producer.last_seen = now
+        producer.records += 1
+
+        active = self.active
+        if active is not producer:
+            if (active is None or now - active.last_seen > self.timeout
+                    or producer.priority > active.priority):
+                if active is not None:
+                    self.switches += 1
+                self.active = producer
+            else:
+                self.shadowed += 1
+                return False
+        return True
+
+    def _prune(self, now: float) -> None:
+        """Forget producers that are not live (and never the one on air)."""
+        for name, producer in list(self.producers.items()):
+            if producer is not self.active and now - producer.last_seen > self.timeout:
+                del self.producers[name]
+
+    def status(self, now: float | None = None) -> dict[str, str]:
+        """Return the listen_* status fields (safe to call from another thread)."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            producers = list(self.producers.values())
+        live = sorted((p for p in producers if now - p.last_seen <= self.timeout),
+                      key=lambda p: (-p.priority, p.name))
+        active = self.active
+        return {
+            "active": active.name if active and now - active.last_seen <= self.timeout else "",
+            "producers": ",".join(f"{p.name}:{p.priority}" for p in live),
+            "switches": str(self.switches),
+            "shadowed": str(self.shadowed),
+            "rejected": str(self.rejected),
+        }
+
+
+class Listener:
+    """Datagram socket feeding arbitrated record lines to a daemon's send loop."""
+
+    def __init__(self, address: tuple[int, object], stats: DaemonStats,
+                 overrides: dict[str, int] | None = None,
+                 timeout: float = FAILOVER_TIMEOUT) -> None:
+        """Bind the listen socket.
+
+        @param address: (family, bind address) from parse_listen().
+        @param stats: Counters; parse errors and the arbiter are recorded here.
+        @param overrides: Producer priority overrides.
+        @param timeout: Failover timeout in seconds.
+        @raise OSError: If the address cannot be bound.
+        """
+        family, self.address = address
+        self.path = self.address if family != socket.AF_INET else None
+        if self.path and os.path.exists(self.path) and stat.S_ISSOCK(os.stat(self.path).st_mode):
+            os.unlink(self.path)            # stale socket from a crashed daemon
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.sock.bind(self.address)
+        self.stats = stats
+        stats.arbiter = self.arbiter = Arbiter(overrides, timeout)
+
+    def records(self):
+        """Yield record lines that won arbitration, forever.
+
+        Records are validated before arbitration, so malformed or out-of-range
+        ones are counted as parse errors and never keep a producer live.
+        """
+        recv, offer, monotonic = self.sock.recvfrom, self.arbiter.offer, time.monotonic
+        parse_failed = self.stats.parse_failed
+        while True:
+            data, sender = recv(4096)
+            now = monotonic()
+            for line in data.decode("utf-8", "replace").splitlines():
+                parts = line.split()
+                if not parts:
+                    continue
+                try:
+                    if len(parts) < 5 or not tc_in_range(*(int(p) for p in parts[:5])):
+                        parse_failed(f"bad record: {line!r}")
+                        continue
+                    priority = int(parts[6]) if len(parts) > 6 else 0
+                except ValueError:
+                    parse_failed(f"parse error: {line!r}")
+                    continue
+                if len(parts) > 5:
+                    name = parts[5]
+                elif isinstance(sender, tuple):
+                    name = f"{sender[0]}:{sender[1]}"
+                elif sender:
+                    name = sender             # bound Unix socket path
+                else:
+                    parse_failed(f"producer name required on a Unix socket: {line!r}")
+                    continue
+                if offer(name, priority, now):
+                    yield line
+
+    def close(self) -> None:
+        """Close the socket and remove a Unix socket path."""
+        self.sock.close()
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+# ── Start-up ─────────────────────────────────────────────────────────────────
+
+def add_daemon_args(parser: argparse.ArgumentParser) -> None:
+    """Add every shared daemon option: status, profiling, socket, realtime, listen."""
+    add_status_args(parser)
+    add_profile_args(parser)
+    add_socket_args(parser)
+    add_realtime_args(parser)
+    add_listen_args(parser)
+
+
+class DaemonSession:
+    """Start-up and shutdown shared by the daemons around their send loop.
+
+    Applies the add_daemon_args() options in the order the loop needs them:
+    profiler, socket options, record source and status thread, then
+    --realtime last so only the send loop runs prioritised.
+    """
+
+    def __init__(self, prog: str, parser: argparse.ArgumentParser,
+                 args: argparse.Namespace, sock: socket.socket) -> None:
+        """Start everything except the send loop; exits on a bad option.
+
+        @param prog: Prefix for stderr messages and profile reports (e.g. "artnet").
+        @param parser: Parser that produced args, for usage errors.
+        @param args: Parsed arguments including the add_daemon_args() options.
+        @param sock: The daemon's UDP socket.
+        """
+        self.stats = stats = DaemonStats()
+        try:
+            profiler = start_profiling(prog, args.profile, args.profile_dir)
+        except ValueError as e:
+            parser.error(str(e))
+        if profiler:
+            profiler.add_counters(stats.as_dict)
+        apply_socket_options(sock, args, stats, prog)
+
+        # Record source: stdin from reatc_outputs.lua, or producers on --listen
+        self.listener = None
+        self.source = sys.stdin
+        if args.listen:
+            try:
+                self.listener = Listener(args.listen, stats, dict(args.priority), args.failover)
+            except OSError as e:
+                print(f"{prog}: cannot listen on {args.listen[1]}: {e}", file=sys.stderr)
+                sys.exit(1)
+            self.source = self.listener.records()
+            signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+        self.status = StatusWriter(args.status, stats, args.status_interval) if args.status else None
+        if self.status:
+            self.status.start()
+        self.freeze_after = apply_realtime(args, stats, prog)
+
+    def close(self) -> None:
+        """Publish the final status and close the listen socket."""
+        if self.status:
+            self.status.stop()
+        if self.listener:
+            self.listener.close()
@@ -8,8 +8,35 @@
 #
 # Usage: python3 reatc_ltcgen.py <fps_type> <h> <m> <s> <f>
 #                                <n_frames> <sample_rate> <output_path>
+#                                [amplitude] [--shaped] [--index]
 #
 # fps_type: 0=24fps  1=25fps  2=29.97DF  3=30fps
+# --shaped: SMPTE 12M rise-time edges (~25 µs 10-90 %) instead of square edges
+# --index:  also write a TC → sample sidecar index next to the WAV
+#           (<output>.ltcidx, see reatc_ltcindex.py)
+#
+# Every mode accepts --profile=cpu,mem and --profile-dir=<dir> (or
+# --profile cpu,mem / --profile-dir <dir>, or the
+# REATC_PROFILE / REATC_PROFILE_DIR environment variables) to write a
+# cProfile/tracemalloc report at exit — see reatc_profile.py.
+#
+#        python3 reatc_ltcgen.py --boundary-report [n_frames]
+#
+#        python3 reatc_ltcgen.py --segments <segments_file> <sample_rate>
+#                                <output_path> [amplitude] [gap_fill] [--shaped]
+#                                [--index]
+#
+# Renders one continuous WAV from a segment list (one segment per line:
+# "<pos_sec> <h> <m> <s> <f> <fps_type> <duration_sec>").  The file starts at
+# the earliest segment position; gap_fill is "silence" (default) or "freerun"
+# (previous segment's code keeps running until the next segment starts).
+#
+#        python3 reatc_ltcgen.py --benchmark [seconds]
+#
+# Times square vs shaped rendering of the same LTC.
+#
+# --boundary-report prints the frame-boundary error of the exact rational scheduler against the
+# legacy float scheduler for every fps x sample-rate combination.
 #
 # @noindex
 # @version {{VERSION}}
@@ -18,14 +45,27 @@ from __future__ import annotations
 
 __version__ = "{{VERSION}}"
 
+import math
 import sys
 import struct
+import time
 import wave
+from functools import lru_cache
+
+from reatc_profile import pop_profile_args, start_profiling
 
 # Integer frame counts (29.97 DF uses 30 integer frames per display frame)
 FPS_INT = {0: 24, 1: 25, 2: 30, 3: 30}
-# Exact frame rates (used for sample-accurate frame boundaries)
+# Nominal frame rates (display only — scheduling uses FPS_RATIONAL)
 FPS_VAL = {0: 24.0, 1: 25.0, 2: 29.97, 3: 30.0}
+# Exact frame rates as (numerator, denominator): 29.97 DF is really 30000/1001
+FPS_RATIONAL = {0: (24, 1), 1: (25, 1), 2: (30000, 1001), 3: (30, 1)}
+
+# Sample rates covered by the boundary report
+REPORT_SAMPLE_RATES = (44100, 48000, 88200, 96000, 176400, 192000)
+
+# Frames in one 24-hour timecode day, per fps_type
+FRAMES_PER_DAY = {0: 24 * 86400, 1: 25 * 86400, 2: 2_589_408, 3: 30 * 86400}
 
 # SMPTE LTC sync word (bits 64-79), stored LSB-first — matches reatc_ltc.jsfx
 SYNC_WORD = 0x3FFD
@@ -33,6 +73,11 @@ SYNC_WORD = 0x3FFD
 # Output amplitude: ~50 % of int16 range, leaves headroom for the decoder
 AMPLITUDE = 16383
 
+# SMPTE 12M LTC rise/fall time, 10 % to 90 % (25 ± 5 µs)
+RISE_TIME = 25e-6
+# A raised-cosine step of width W rises 10-90 % in this fraction of W
+_RC_10_90 = (math.acos(-0.8) - math.acos(0.8)) / math.pi
+
 
 def build_ltc_frame(h: int, m: int, s: int, f: int, fps_type: int) -> list[int]:
     """Build the 80-bit LTC word as a list of ints (0 or 1), LSB-first.
@@ -123,7 +168,108 @@ def advance_tc(h: int, m: int, s: int, f: int, fps_type: int) -> tuple[int, int,
     return h, m, s, f
 
 
-def render_frame(bits: list[int], n_samples: int, gen_out: int, amplitude: int = AMPLITUDE) -> tuple[bytes, int]:
+def tc_is_valid(h: int, m: int, s: int, f: int, fps_type: int) -> bool:
+    """Return True if the timecode exists at this frame rate.
+
+    Drop-frame labels 00 and 01 do not exist at minutes not divisible by 10.
+    """
+    if not (0 <= h < 24 and 0 <= m < 60 and 0 <= s < 60 and 0 <= f < FPS_INT[fps_type]):
+        return False
+    return not (fps_type == 2 and s == 0 and f < 2 and m % 10 != 0)
+
+
+def frame_sample_counts(fps_type: int, sample_rate: int):
+    """Yield the sample count of each successive frame, forever.
+
+    Frame k starts at sample round(k * sample_rate / fps) with fps taken from
+    FPS_RATIONAL and ties rounded up.  The boundary is tracked with an integer
+    quotient/remainder accumulator in doubled units, so there is no float
+    division and no drift: frame 30000 at 29.97 DF / 48 kHz starts exactly at
+    sample 48 048 000.
+
+    @param fps_type: Frame-rate type (0=24fps, 1=25fps, 2=29.97DF, 3=30fps).
+    @param sample_rate: Audio sample rate in Hz.
+    @return: Generator of per-frame sample counts.
+    """
+    num, den = FPS_RATIONAL[fps_type]
+    unit = 2 * num                              # denominator of the accumulator
+    q_step, r_step = divmod(2 * sample_rate * den, unit)
+    rem = num                                   # +0.5 sample for round-half-up
+    while True:
+        n = q_step
+        rem += r_step
+        if rem >= unit:
+            rem -= unit
+            n += 1
+        yield n
+
+
+def frame_start_sample(frame_idx: int, fps_type: int, sample_rate: int) -> int:
+    """Return the exact first sample of a frame (closed form of frame_sample_counts).
+
+    @param frame_idx: Zero-based frame index from the start of the render.
+    @param fps_type: Frame-rate type (0=24fps, 1=25fps, 2=29.97DF, 3=30fps).
+    @param sample_rate: Audio sample rate in Hz.
+    @return: Sample offset of the frame's first sample.
+    """
+    num, den = FPS_RATIONAL[fps_type]
+    return (2 * frame_idx * sample_rate * den + num) // (2 * num)
+
+
+@lru_cache(maxsize=16)
+def half_bit_edges(n_samples: int) -> tuple[int, ...]:
+    """Return the 161 half-bit boundaries of a frame of n_samples samples.
+
+    Edge j sits at round(j * n_samples / 160) (ties rounded up); even j are
+    bit boundaries, odd j are bit midpoints.  Computed with an integer
+    accumulator and cached — a render only ever sees two or three distinct
+    frame lengths.
+
+    @param n_samples: Number of PCM samples in the frame.
+    @return: Tuple of 161 sample offsets, starting at 0 and ending at n_samples.
+    """
+    q_step, r_step = divmod(2 * n_samples, 320)
+    pos, rem = 0, 160                           # +0.5 sample for round-half-up
+    edges = [0]
+    for _ in range(160):
+        pos += q_step
+        rem += r_step
+        if rem >= 320:
+            rem -= 320
+            pos += 1
+        edges.append(pos)
+    return tuple(edges)
+
+
+@lru_cache(maxsize=8)
+def edge_kernel(sample_rate: int, amplitude: int = AMPLITUDE) -> tuple[bytes, bytes]:
+    """Precompute band-limited transition shapes for one sample rate and amplitude.
+
+    The transition is a raised-cosine step whose 10-90 % rise time is
+    RISE_TIME, sampled at sample centres from the moment of the transition
+    (so shaped edges lag square edges by half the step, ~21 µs).  Only the
+    samples strictly between the two levels are kept; the falling shape is
+    the exact negation of the rising one, so inverting a shaped frame still
+    yields a valid shaped frame.
+
+    @param sample_rate: Audio sample rate in Hz.
+    @param amplitude: Peak sample value.
+    @return: Tuple of (rising, falling) int16 PCM bytes, pasted at the start
+             of each half-bit segment that follows a transition.
+    """
+    width = RISE_TIME / _RC_10_90           # full raised-cosine width (s)
+    rising = []
+    j = 0
+    while (j + 0.5) / sample_rate < width:
+        step = (1 - math.cos(math.pi * (j + 0.5) / (sample_rate * width))) / 2
+        rising.append(round(amplitude * (2 * step - 1)))
+        j += 1
+    return (struct.pack(f"<{len(rising)}h", *rising),
+            struct.pack(f"<{len(rising)}h", *(-v for v in rising)))
+
+
+def render_frame(bits: list[int], n_samples: int, gen_out: int, amplitude: int = AMPLITUDE,
+                 kernel: tuple[bytes, bytes] | None = None) -> tuple[bytes, int]:
     """Convert 80 LTC bits to n_samples int16 PCM bytes using biphase-mark.
 
     Encoding rules (matches reatc_ltc.jsfx @sample block):
@@ -134,32 +280,52 @@ def render_frame(bits: list[int], n_samples: int, gen_out: int, amplitude: int =
     @param n_samples: Number of PCM samples to generate for this frame.
     @param gen_out: Current output polarity (+1 or -1).
     @param amplitude: Peak sample value (default AMPLITUDE).
+    @param kernel: Optional (rising, falling) shapes from edge_kernel(); each
+                   transition starts with the matching shape instead of an
+                   instantaneous jump.  None renders an ideal square wave.
     @return: Tuple of (raw PCM bytes, final gen_out polarity).
     """
     pos_bytes = struct.pack("<h",  amplitude)
     neg_bytes = struct.pack("<h", -amplitude)
 
-    def smp(level):
-        return pos_bytes if level > 0 else neg_bytes
+    if kernel is None:
+        def smp(level):
+            return pos_bytes if level > 0 else neg_bytes
+
+        def segment(level, n):
+            return smp(level) * n
+    else:
+        rise, fall = kernel
+        k_len = len(rise) // 2
+
+        def segment(level, n):
+            if level > 0:
+                head, flat = rise, pos_bytes
+            else:
+                head, flat = fall, neg_bytes
+            if n <= k_len:
+                return head[:2 * n]
+            return head + flat * (n - k_len)
+
+    edges = half_bit_edges(n_samples)
 
     parts = []
     for i, bit in enumerate(bits):
-        bit_start = round(i       * n_samples / 80)
-        bit_mid   = round((i + 0.5) * n_samples / 80)
-        bit_end   = round((i + 1)   * n_samples / 80)
+        bit_start = edges[2 * i]
+        bit_mid   = edges[2 * i + 1]
+        bit_end   = edges[2 * i + 2]
 
         n_first  = bit_mid - bit_start
         n_second = bit_end - bit_mid
 
-        # First half of bit at current level
-        parts.append(smp(gen_out) * n_first)
-
-        # Mid-bit transition for 1-bits
         if bit:
+            # First half, mid-bit transition, second half
+            parts.append(segment(gen_out, n_first))
             gen_out = -gen_out
-
-        # Second half of bit
-        parts.append(smp(gen_out) * n_second)
+            parts.append(segment(gen_out, n_second))
+        else:
+            # No mid-bit transition: one level for the whole bit
+            parts.append(segment(gen_out, n_first + n_second))
 
         # Boundary transition (always, at start of next bit)
         gen_out = -gen_out
@@ -167,9 +333,105 @@ def render_frame(bits: list[int], n_samples: int, gen_out: int, amplitude: int =
     return b"".join(parts), gen_out
 
 
+class DeltaRenderer:
+    """Render successive LTC frames by patching the previous frame's PCM.
+
+    Between consecutive frames usually only the frame-units nibble and the
+    BMPC bit change.  Flipping bit i moves its mid-bit transition, which
+    inverts the polarity of every sample after that midpoint; with an even
+    number of changed bits (BMPC guarantees it) the inversions pair up into
+    closed blocks [mid_a, mid_b).  Each block is inverted by swapping it with
+    the same span of a polarity-inverted twin buffer — two slice copies.
+
+    One buffer pair is kept per frame length, so 29.97DF's alternating
+    1601/1602-sample frames each patch against their own predecessor.  A full
+    render happens only for a new frame length or a different starting
+    polarity.  Output is byte-identical to render_frame().
+
+    With an edge kernel the transition shape at each changed midpoint is
+    repainted after the swaps (a transition appears or disappears there).
+    """
+
+    def __init__(self, amplitude: int = AMPLITUDE, kernel: tuple[bytes, bytes] | None = None) -> None:
+        """Create a renderer.
+
+        @param amplitude: Peak sample value (default AMPLITUDE).
+        @param kernel: Optional edge shapes from edge_kernel() (None = square).
+        """
+        self.amplitude = amplitude
+        self.kernel = kernel
+        self._pos = struct.pack("<h",  amplitude)
+        self._neg = struct.pack("<h", -amplitude)
+        # n_samples -> [pcm, inverted pcm, bits, starting gen_out]
+        self._cache: dict[int, list] = {}
+
+    def render(self, bits: list[int], n_samples: int, gen_out: int) -> tuple[bytearray, int]:
+        """Render one frame, reusing the cached PCM for this frame length.
+
+        The returned bytearray is owned by the renderer and is overwritten by
+        the next render() call with the same n_samples — consume it first.
+
+        @param bits: List of 80 ints (0 or 1) from build_ltc_frame().
+        @param n_samples: Number of PCM samples to generate for this frame.
+        @param gen_out: Current output polarity (+1 or -1).
+        @return: Tuple of (PCM bytearray, final gen_out polarity).
+        """
+        end_out = gen_out if sum(bits) % 2 == 0 else -gen_out
+        entry = self._cache.get(n_samples)
+
+        if entry is None or entry[3] != gen_out:
+            if len(self._cache) >= 4:
+                self._cache.clear()
+            pcm, _ = render_frame(bits, n_samples,  gen_out, self.amplitude, self.kernel)
+            inv, _ = render_frame(bits, n_samples, -gen_out, self.amplitude, self.kernel)
+            entry = [bytearray(pcm), bytearray(inv), list(bits), gen_out]
+            edges = half_bit_edges(n_samples)
+            shortest = min(b - a for a, b in zip(edges, edges[1:]))
+            if self.kernel is None or shortest > len(self.kernel[0]) // 2:
+                self._cache[n_samples] = entry  # patchable
+            return entry[0], end_out
+
+        buf, inv, prev, _ = entry
+        mids = [2 * i + 1 for i, (new, old) in enumerate(zip(bits, prev)) if new != old]
+        if mids:
+            edges = half_bit_edges(n_samples)
+            changed = list(mids)
+            # Invert between pairs of changed midpoints; an odd tail runs to frame end
+            if len(mids) % 2:
+                mids.append(160)
+            for a, b in zip(mids[::2], mids[1::2]):
+                lo, hi = 2 * edges[a], 2 * edges[b]
+                block = buf[lo:hi]
+                buf[lo:hi] = inv[lo:hi]
+                inv[lo:hi] = block
+            if self.kernel is not None:
+                for j in changed:
+                    self._repaint_mid(buf, inv, edges, j, bits[j // 2])
+            entry[2] = list(bits)
+
+        return buf, end_out
+
+    def _repaint_mid(self, buf: bytearray, inv: bytearray, edges: tuple[int, ...],
+                     j: int, bit: int) -> None:
+        """Rewrite the kernel window at half-bit edge j after a bit change."""
+        rise, fall = self.kernel
+        lo, hi = 2 * edges[j], 2 * edges[j + 1]
+        width = len(rise)
+        # Level after the midpoint: last sample of the half bit is always flat
+        positive = buf[hi - 2:hi] == self._pos
+        if bit:
+            head, twin = (rise, fall) if positive else (fall, rise)
+        else:
+            head, twin = (self._pos, self._neg) if positive else (self._neg, self._pos)
+            head, twin = head * (width // 2), twin * (width // 2)
+        buf[lo:lo + width] = head
+        inv[lo:lo + width] = twin
+
+
 def generate_ltc_wav(fps_type: int, h: int, m: int, s: int, f: int,
                      n_frames: int, sample_rate: int, out_path: str,
-                     amplitude: int = AMPLITUDE) -> None:
+                     amplitude: int = AMPLITUDE, shaped: bool = False,
+                     index_path: str | None = None) -> None:
     """Write a mono 16-bit WAV containing n_frames of LTC audio.
 
     @param fps_type: Frame-rate type (0=24fps, 1=25fps, 2=29.97DF, 3=30fps).
@@ -181,36 +443,302 @@ def generate_ltc_wav(fps_type: int, h: int, m: int, s: int, f: int,
     @param sample_rate: Audio sample rate in Hz (e.g. 48000).
     @param out_path: Filesystem path for the output WAV file.
     @param amplitude: Peak sample value (default AMPLITUDE).
+    @param shaped: Use SMPTE rise-time edges (edge_kernel) instead of square.
+    @param index_path: Also write a TC → sample index here (reatc_ltcindex).
     """
-    fps_val = FPS_VAL[fps_type]
     gen_out = 1  # initial polarity
     ch, cm, cs, cf = h, m, s, f
+    counts = frame_sample_counts(fps_type, sample_rate)
+    renderer = DeltaRenderer(amplitude, edge_kernel(sample_rate, amplitude) if shaped else None)
 
     with wave.open(out_path, "w") as wav:
         wav.setnchannels(1)
         wav.setsampwidth(2)       # 16-bit PCM
         wav.setframerate(sample_rate)
 
-        for frame_idx in range(n_frames):
-            # Sample-accurate frame boundary (same rounding as JSFX phase acc)
-            frame_start = round(frame_idx       * sample_rate / fps_val)
-            frame_end   = round((frame_idx + 1) * sample_rate / fps_val)
-            n_samples   = frame_end - frame_start
+        for _ in range(n_frames):
+            # Exact rational frame boundary (integer accumulator, no drift)
+            n_samples = next(counts)
 
             bits = build_ltc_frame(ch, cm, cs, cf, fps_type)
-            frame_bytes, gen_out = render_frame(bits, n_samples, gen_out,
-                                                amplitude)
-            wav.writeframes(frame_bytes)
+            frame_pcm, gen_out = renderer.render(bits, n_samples, gen_out)
+            wav.writeframes(frame_pcm)
 
             ch, cm, cs, cf = advance_tc(ch, cm, cs, cf, fps_type)
 
+    if index_path:
+        from reatc_ltcindex import IndexBuilder
+        builder = IndexBuilder(sample_rate)
+        builder.add_generated(h, m, s, f, fps_type, n_frames)
+        builder.write(index_path)
+
+
+GAP_FILLS = ("silence", "freerun")
+
+
+def parse_segments(lines) -> list[tuple[float, int, int, int, int, int, float]]:
+    """Parse segment lines into (pos, h, m, s, f, fps_type, duration) tuples.
+
+    Blank lines and lines starting with '#' are ignored.
+
+    @param lines: Iterable of "<pos> <h> <m> <s> <f> <fps_type> <duration>" strings.
+    @return: List of segment tuples, sorted by project position.
+    @raise ValueError: On a malformed line or out-of-range field.
+    """
+    segments = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        parts = line.split()
+        if len(parts) != 7:
+            raise ValueError(f"segment needs 7 fields: {line!r}")
+        pos, dur = float(parts[0]), float(parts[6])
+        h, m, sec, f, fps_type = (int(v) for v in parts[1:6])
+        if (fps_type not in FPS_RATIONAL or dur <= 0 or pos < 0
+                or not tc_is_valid(h, m, sec, f, fps_type)):
+            raise ValueError(f"segment out of range: {line!r}")
+        segments.append((pos, h, m, sec, f, fps_type, dur))
+    segments.sort(key=lambda seg: seg[0])
+    return segments
+
+
+def _stream_frames(wav, renderer: DeltaRenderer, fps_type: int, tc: tuple[int, int, int, int],
+                   sample_rate: int, n_total: int, gen_out: int) -> tuple[int, int]:
+    """Write n_total samples of LTC starting at tc, truncating the last frame.
+
+    @return: Tuple of (output polarity after the last complete frame,
+             number of frames started).
+    """
+    ch, cm, cs, cf = tc
+    counts = frame_sample_counts(fps_type, sample_rate)
+    n_frames = 0
+    while n_total > 0:
+        n_frames += 1
+        n_samples = next(counts)
+        bits = build_ltc_frame(ch, cm, cs, cf, fps_type)
+        frame_pcm, gen_out = renderer.render(bits, n_samples, gen_out)
+        if n_samples > n_total:
+            frame_pcm = frame_pcm[:2 * n_total]
+        wav.writeframes(frame_pcm)
+        n_total -= n_samples
+        ch, cm, cs, cf = advance_tc(ch, cm, cs, cf, fps_type)
+    return gen_out, n_frames
+
+
+def generate_ltc_segments_wav(segments, sample_rate: int, out_path: str,
+                              amplitude: int = AMPLITUDE, gap_fill: str = "silence",
+                              shaped: bool = False, index_path: str | None = None,
+                              counters: dict[str, int] | None = None) -> int:
+    """Write one continuous mono 16-bit WAV covering every segment.
+
+    Segments are placed at their project positions (rounded to the nearest
+    sample) relative to the first one; each starts a fresh frame at its own TC
+    and fps.  An overlapping segment cuts the previous one short.  Gaps are
+    filled with digital silence or, with gap_fill="freerun", by letting the
+    previous segment's code keep running up to the next segment.  Rendering
+    is a single streaming pass.
+
+    @param segments: Sequence of (pos, h, m, s, f, fps_type, duration) tuples
+                     as returned by parse_segments(), sorted by position.
+    @param sample_rate: Audio sample rate in Hz.
+    @param out_path: Filesystem path for the output WAV file.
+    @param amplitude: Peak sample value (default AMPLITUDE).
+    @param gap_fill: "silence" or "freerun".
+    @param shaped: Use SMPTE rise-time edges (edge_kernel) instead of square.
+    @param index_path: Also write a TC → sample index here (reatc_ltcindex).
+    @param counters: If given, "frames_rendered" is added to it (for profiling).
+    @return: Total number of samples written.
+    @raise ValueError: If segments is empty or gap_fill is unknown.
+    """
+    if not segments:
+        raise ValueError("no segments")
+    if gap_fill not in GAP_FILLS:
+        raise ValueError(f"gap_fill must be one of {GAP_FILLS}, got {gap_fill!r}")
+
+    origin = round(segments[0][0] * sample_rate)
+    bounds = []
+    for pos, h, m, sec, f, fps_type, dur in segments:
+        start = round(pos * sample_rate) - origin
+        bounds.append((start, start + round(dur * sample_rate), (h, m, sec, f), fps_type))
+
+    renderer = DeltaRenderer(amplitude, edge_kernel(sample_rate, amplitude) if shaped else None)
+    gen_out = 1
+    written = 0
+    frames_rendered = 0
+    builder = None
+    if index_path:
+        from reatc_ltcindex import IndexBuilder, frames_started
+        builder = IndexBuilder(sample_rate)
+    silence = bytes(2 * sample_rate)  # one second of zero samples
+
+    with wave.open(out_path, "w") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)       # 16-bit PCM
+        wav.setframerate(sample_rate)
+
+        for idx, (start, end, tc, fps_type) in enumerate(bounds):
+            next_start = bounds[idx + 1][0] if idx + 1 < len(bounds) else end
+            # The next segment always wins: cut overlaps, or free-run into the gap
+            end = next_start if gap_fill == "freerun" else min(end, next_start)
+            if end <= start:
+                continue
+
+            gen_out, n_frames = _stream_frames(wav, renderer, fps_type, tc, sample_rate,
+                                               end - start, gen_out)
+            frames_rendered += n_frames
+            written = end
+            if builder:
+                builder.add_generated(*tc, fps_type,
+                                      frames_started(end - start, fps_type, sample_rate), start)
+
+            gap = next_start - written
+            while gap > 0:
+                chunk = min(gap, sample_rate)
+                wav.writeframes(silence[:2 * chunk])
+                gap -= chunk
+                written += chunk
+
+    if builder:
+        builder.write(index_path)
+    if counters is not None:
+        counters["frames_rendered"] = counters.get("frames_rendered", 0) + frames_rendered
+    return written
+
+
+def boundary_error_report(n_frames: int | None = None) -> list[dict]:
+    """Measure frame-boundary error for every fps x sample-rate combination.
+
+    For each combination, compares the exact rational scheduler against the
+    ideal boundary k * sample_rate / fps and against the legacy float
+    scheduler (round(k * sample_rate / FPS_VAL)).
+
+    @param n_frames: Render length in frames (default: one 24-hour TC day).
+    @return: One dict per combination with keys fps_type, sample_rate,
+             n_frames, end_sample, max_error (exact scheduler, in samples,
+             always <= 0.5) and float_drift (legacy scheduler's end-of-render
+             offset from the exact end sample, in samples).
+    """
+    rows = []
+    for fps_type, (num, den) in FPS_RATIONAL.items():
+        frames = n_frames if n_frames is not None else FRAMES_PER_DAY[fps_type]
+        for sample_rate in REPORT_SAMPLE_RATES:
+            # Boundary error is periodic in k with period num / gcd(num, sr*den),
+            # so scanning one period (<= num frames) covers the whole render.
+            step = sample_rate * den
+            worst = 0
+            for k in range(min(frames, num) + 1):
+                exact = k * step                  # ideal boundary, units of 1/num
+                err = abs(frame_start_sample(k, fps_type, sample_rate) * num - exact)
+                worst = max(worst, err)
+            end_sample = frame_start_sample(frames, fps_type, sample_rate)
+            float_end = round(frames * sample_rate / FPS_VAL[fps_type])
+            rows.append({
+                "fps_type": fps_type,
+                "sample_rate": sample_rate,
+                "n_frames": frames,
+                "end_sample": end_sample,
+                "max_error": worst / num,
+                "float_drift": float_end - end_sample,
+            })
+    return rows
+
+
+def print_boundary_report(n_frames: int | None = None) -> None:
+    """Print boundary_error_report() as a table on stdout.
+
+    @param n_frames: Render length in frames (default: one 24-hour TC day).
+    """
+    names = {0: "24", 1: "25", 2: "29.97DF", 3: "30"}
+    print(f"{'fps':>8} {'rate':>7} {'frames':>9} {'end sample':>13}"
+          f" {'max err':>8} {'float drift':>12}")
+    for row in boundary_error_report(n_frames):
+        print(f"{names[row['fps_type']]:>8} {row['sample_rate']:>7}"
+              f" {row['n_frames']:>9} {row['end_sample']:>13}"
+              f" {row['max_error']:>8.4f} {row['float_drift']:>12}")
+
+
+def benchmark_shaping(seconds: float = 600.0, sample_rate: int = 48000,
+                      fps_type: int = 2) -> dict[str, float]:
+    """Time square vs shaped rendering of the same LTC to a scratch WAV.
+
+    @param seconds: Length of LTC to render per mode.
+    @param sample_rate: Audio sample rate in Hz.
+    @param fps_type: Frame-rate type (0=24fps, 1=25fps, 2=29.97DF, 3=30fps).
+    @return: Dict with "square" and "shaped" wall-clock seconds.
+    """
+    import os
+    import tempfile
+
+    num, den = FPS_RATIONAL[fps_type]
+    n_frames = int(seconds * num / den)
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "bench.wav")
+        for mode in ("square", "shaped"):
+            t0 = time.perf_counter()
+            generate_ltc_wav(fps_type, 0, 0, 0, 0, n_frames, sample_rate, out,
+                             shaped=(mode == "shaped"))
+            timings[mode] = time.perf_counter() - t0
+    return timings
+
 
 def main() -> None:
     """Entry point: parse CLI arguments and generate an LTC WAV file."""
+    try:
+        profiler = start_profiling("ltcgen", *pop_profile_args(sys.argv))
+    except ValueError as e:
+        print(f"reatc_ltcgen.py: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    shaped = "--shaped" in sys.argv
+    with_index = "--index" in sys.argv
+    sys.argv = [arg for arg in sys.argv if arg not in ("--shaped", "--index")]
+    if with_index:
+        from reatc_ltcindex import index_path_for
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--benchmark":
+        seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 600.0
+        timings = benchmark_shaping(seconds)
+        for mode, elapsed in timings.items():
+            print(f"{mode:>7}: {elapsed:7.3f} s for {seconds:g} s of LTC"
+                  f" ({seconds / elapsed:6.0f}x realtime)")
+        print(f"shaped/square: {timings['shaped'] / timings['square']:.2f}")
+        return
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--boundary-report":
+        print_boundary_report(int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        return
+
+    if len(sys.argv) >= 2 and sys.argv[1] == "--segments":
+        if len(sys.argv) < 5:
+            print(
+                "Usage: reatc_ltcgen.py --segments <segments_file> <sample_rate>"
+                " <output_path> [amplitude] [gap_fill] [--shaped] [--index]",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        try:
+            with open(sys.argv[2], "r", encoding="utf-8") as fh:
+                segments = parse_segments(fh)
+        except (OSError, ValueError) as e:
+            print(f"reatc_ltcgen.py: {e}", file=sys.stderr)
+            sys.exit(1)
+        sample_rate = int(sys.argv[3])
+        amplitude   = max(1, min(32767, int(sys.argv[5]))) if len(sys.argv) > 5 else AMPLITUDE
+        gap_fill    = sys.argv[6] if len(sys.argv) > 6 else "silence"
+        written = generate_ltc_segments_wav(
+            segments, sample_rate, sys.argv[4], amplitude, gap_fill, shaped,
+            index_path_for(sys.argv[4]) if with_index else None,
+            profiler.counters if profiler else None)
+        if profiler:
+            profiler.counters.update(segments=len(segments), bytes_written=2 * written)
+        return
+
     if len(sys.argv) < 9:
         print(
             "Usage: reatc_ltcgen.py <fps_type> <h> <m> <s> <f>"
-            " <n_frames> <sample_rate> <output_path>",
+            " <n_frames> <sample_rate> <output_path> [amplitude] [--shaped] [--index]",
             file=sys.stderr,
         )
         sys.exit(1)
@@ -226,7 +754,11 @@ def main() -> None:
     amplitude   = max(1, min(32767, int(sys.argv[9]))) if len(sys.argv) > 9 else AMPLITUDE
 
     generate_ltc_wav(fps_type, h, m, s, f, n_frames, sample_rate, out_path,
-                     amplitude)
+                     amplitude, shaped, index_path_for(out_path) if with_index else None)
+    if profiler:
+        profiler.counters.update(
+            frames_rendered=n_frames,
+            bytes_written=2 * frame_start_sample(n_frames, fps_type, sample_rate))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+# ReaTC — https://github.com/paskateknikko/ReaTC
+# Copyright (c) 2025 Tuukka Aimasmäki. MIT License — see LICENSE.
+#
+# LTC Timecode → Sample Index
+# Compact sidecar index that answers "where is 01:23:45:10?" in a baked or
+# recorded LTC WAV without decoding from the beginning.  Standard library only.
+#
+# Usage: python3 reatc_ltcindex.py build <wav_path> [index_path]
+#                                  [--channel N] [--fps T] [--tolerance S]
+#        python3 reatc_ltcindex.py lookup <index_path> <HH:MM:SS:FF> [...]
+#        python3 reatc_ltcindex.py dump <index_path>
+#
+# "build" decodes the LTC in a recorded WAV (8/16/24/32-bit PCM) and writes
+# the index; reatc_ltcgen.py --index writes it at bake time for free.  The
+# default index path is the WAV path with an .ltcidx extension.
+#
+# File format (little-endian), loaded with mmap — nothing is parsed up front:
+#
+#   header  "RTCX" u16 version, u16 record size, u32 sample rate, u32 runs
+#   runs    one 40-byte record per run of consecutive frames, sorted by
+#           start label:
+#             u32 start label, u32 end label, u32 reach, u32 rate_den,
+#             u64 first sample, u64 rate_num, u32 phase, u8 fps_type
+#
+# A label is ((h * 60 + m) * 60 + s) * 32 + f, so runs of any fps sort in TC
+# order.  Frame k of a run starts at sample
+#     first + (2 * k * rate_num + phase) // (2 * rate_den)
+# which reproduces reatc_ltcgen.frame_start_sample() exactly for baked files
+# and the fitted line through the decoded frame starts for recordings.
+# "reach" is the largest end label of this and all earlier records, so an
+# overlap scan stops as soon as no earlier run can contain the label.
+#
+# @noindex
+# @version {{VERSION}}
+
+from __future__ import annotations
+
+__version__ = "{{VERSION}}"
+
+import mmap
+import os
+import re
+import struct
+import sys
+import wave
+from itertools import chain
+
+from reatc_ltcgen import (
+    FPS_INT, FPS_RATIONAL, FRAMES_PER_DAY, SYNC_WORD, advance_tc, tc_is_valid,
+)
+
+INDEX_MAGIC = b"RTCX"
+INDEX_VERSION = 1
+INDEX_EXT = ".ltcidx"
+_HEADER = struct.Struct("<4sHHII")
+_RECORD = struct.Struct("<IIIIQQIB3x")
+_LABEL = struct.Struct("<I")
+
+# Decoded frame starts may deviate this many samples from their run's line
+DEFAULT_TOLERANCE = 2.0
+# Samples read from the WAV per decoder chunk
+DECODE_CHUNK = 1 << 20
+# Decoder hysteresis: a sample changes side only beyond this fraction of the
+# chunk's peak level, which at least PEAK_SHARE of its samples reach (so a
+# click does not raise the threshold); the peak is taken from every
+# PEAK_STRIDE-th sample
+HYSTERESIS = 0.25
+PEAK_SHARE = 0.001
+PEAK_STRIDE = 16
+# Most significant byte → signed level in MSB units
+_MSB_SIGNED = [b - 256 if b >= 128 else b for b in range(256)]
+_MSB_UNSIGNED = [b - 128 for b in range(256)]   # 8-bit WAV
+# Side of the hysteresis band: 0 = high, 1 = low, 2 = inside (keeps the last side)
+_RUNS_RE = re.compile(rb"\x00[\x00\x02]*|\x01[\x01\x02]*|\x02+")
+
+
+# ── Timecode helpers ─────────────────────────────────────────────────────────
+
+def tc_label(h: int, m: int, s: int, f: int) -> int:
+    """Return the fps-independent sort key for a timecode."""
+    return ((h * 60 + m) * 60 + s) * 32 + f
+
+
+def label_tc(label: int) -> tuple[int, int, int, int]:
+    """Inverse of tc_label()."""
+    secs, f = divmod(label, 32)
+    mins, s = divmod(secs, 60)
+    h, m = divmod(mins, 60)
+    return h, m, s, f
+
+
+def tc_frame_number(h: int, m: int, s: int, f: int, fps_type: int) -> int:
+    """Return the frame number of a timecode counted from 00:00:00:00.
+
+    @param h: Hours (0-23).
+    @param m: Minutes (0-59).
+    @param s: Seconds (0-59).
+    @param f: Frame number.
+    @param fps_type: Frame-rate type (0=24fps, 1=25fps, 2=29.97DF, 3=30fps).
+    @return: Zero-based frame count (drop-frame labels are skipped for 29.97DF).
+    """
+    frames = (h * 3600 + m * 60 + s) * FPS_INT[fps_type] + f
+    if fps_type == 2:
+        minutes = h * 60 + m
+        frames -= 2 * (minutes - minutes // 10)
+    return frames
+
+
+def frame_number_tc(n: int, fps_type: int) -> tuple[int, int, int, int]:
+    """Inverse of tc_frame_number() (n is taken modulo one TC day)."""
+    fps = FPS_INT[fps_type]
+    n %= FRAMES_PER_DAY[fps_type]
+    if fps_type == 2:
+        tens, rem = divmod(n, 17982)        # frames per 10 minutes
+        n += 18 * tens + (2 * ((rem - 2) // 1798) if rem > 1 else 0)
+    secs, f = divmod(n, fps)
+    mins, s = divmod(secs, 60)
+    h, m = divmod(mins, 60)
+    return h, m, s, f
+
+
+def parse_tc(text: str) -> tuple[int, int, int, int]:
+    """Parse "HH:MM:SS:FF" (or ";"/"." before the frames) into a tuple.
+
+    @raise ValueError: On a malformed timecode.
+    """
+    parts = re.split(r"[:;.]", text.strip())
+    if len(parts) != 4:
+        raise ValueError(f"timecode must be HH:MM:SS:FF, got {text!r}")
+    h, m, s, f = (int(p) for p in parts)
+    return h, m, s, f
+
+
+def index_path_for(wav_path: str) -> str:
+    """Return the default sidecar path for a WAV file."""
+    return os.path.splitext(wav_path)[0] + INDEX_EXT
+
+
+def frames_started(n_samples: int, fps_type: int, sample_rate: int) -> int:
+    """Return how many frames of a render start before sample n_samples."""
+    if n_samples <= 0:
+        return 0
+    num, den = FPS_RATIONAL[fps_type]
+    return -(-((2 * n_samples - 1) * num) // (2 * sample_rate * den))
+
+
+# ── Writing ──────────────────────────────────────────────────────────────────
+
+class IndexBuilder:
+    """Collects runs in any order and writes them as a sorted index file."""
+
+    def __init__(self, sample_rate: int) -> None:
+        """Create an empty builder.
+
+        @param sample_rate: Sample rate of the indexed WAV in Hz.
+        """
+        self.sample_rate = sample_rate
+        self.runs: list[tuple[int, int, int, int, int, int, int]] = []
+
+    def add_run(self, h: int, m: int, s: int, f: int, fps_type: int, n_frames: int,
+                first_sample: int, rate_num: int, rate_den: int, phase: int | None = None) -> None:
+        """Add n_frames consecutive frames starting at a timecode.
+
+        Runs that pass midnight are split so labels increase within a run.
+
+        @param h: Starting hours (0-23).
+        @param m: Starting minutes (0-59).
+        @param s: Starting seconds (0-59).
+        @param f: Starting frame number.
+        @param fps_type: Frame-rate type (0=24fps, 1=25fps, 2=29.97DF, 3=30fps).
+        @param n_frames: Number of frames in the run (>= 1).
+        @param first_sample: Sample offset of the run's first frame.
+        @param rate_num: Samples per frame, numerator.
+        @param rate_den: Samples per frame, denominator.
+        @param phase: Rounding phase in units of 1/(2 * rate_den); default
+                      rate_den (round half up).
+        """
+        if phase is None:
+            phase = rate_den
+        start = tc_frame_number(h, m, s, f, fps_type)
+        while n_frames > 0:
+            count = min(n_frames, FRAMES_PER_DAY[fps_type] - start)
+            end = frame_number_tc(start + count - 1, fps_type)
+            self.runs.append((tc_label(h, m, s, f), tc_label(*end), fps_type,
+                              first_sample, rate_num, rate_den, phase))
+            n_frames -= count
+            if n_frames:
+                # Continue after midnight on the same line: fold the elapsed
+                # frames into first_sample and the phase
+                q, phase = divmod(2 * count * rate_num + phase, 2 * rate_den)
+                first_sample += q
+                h, m, s, f = advance_tc(*end, fps_type)
+                start = 0
+
+    def add_generated(self, h: int, m: int, s: int, f: int, fps_type: int,
+                      n_frames: int, first_sample: int = 0) -> None:
+        """Add frames rendered by reatc_ltcgen (exact rational frame boundaries)."""
+        num, den = FPS_RATIONAL[fps_type]
+        self.add_run(h, m, s, f, fps_type, n_frames, first_sample,
+                     self.sample_rate * den, num)
+
+    def write(self, path: str) -> int:
+        """Write the index atomically (via a sibling .tmp file and rename).
+
+        @param path: Output path.
+        @return: Number of runs written.
+        """
+        runs = sorted(self.runs, key=lambda run: (run[0], run[3]))
+        buf = bytearray(_HEADER.size + _RECORD.size * len(runs))
+        _HEADER.pack_into(buf, 0, INDEX_MAGIC, INDEX_VERSION, _RECORD.size,
+                          self.sample_rate, len(runs))
+        reach = 0
+        for i, (start, end, fps_type, first, rate_num, rate_den, phase) in enumerate(runs):
+            reach = max(reach, end)
+            _RECORD.pack_into(buf, _HEADER.size + i * _RECORD.size, start, end, reach,
+                              rate_den, first, rate_num, phase, fps_type)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(buf)
+        os.replace(tmp, path)
+        return len(runs)
+
+
+# ── Reading ──────────────────────────────────────────────────────────────────
+
+class LtcIndex:
+    """Memory-mapped index; lookups binary-search the run table in place."""
+
+    def __init__(self, path: str) -> None:
+        """Open and map an index file.
+
+        @param path: Index file written by IndexBuilder.write().
+        @raise ValueError: If the file is not a ReaTC LTC index.
+        """
+        with open(path, "rb") as fh:
+            size = os.fstat(fh.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{path}: not an LTC index")
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rec_size, self.sample_rate, self.n_runs = _HEADER.unpack_from(self._mm, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or rec_size != _RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{path}: not a version {INDEX_VERSION} LTC index")
+        if size < _HEADER.size + rec_size * self.n_runs:
+            self._mm.close()
+            raise ValueError(f"{path}: truncated LTC index")
+
+    def __len__(self) -> int:
+        return self.n_runs
+
+    def __enter__(self) -> LtcIndex:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._mm.close()
+
+    def run(self, i: int) -> dict:
+        """Return run i as a dict (for dumps and tests)."""
+        start, end, reach, rate_den, first, rate_num, phase, fps_type = \
+            _RECORD.unpack_from(self._mm, _HEADER.size + i * _RECORD.size)
+        return {
+            "start": label_tc(start), "end": label_tc(end), "fps_type": fps_type,
+            "first_sample": first, "rate_num": rate_num, "rate_den": rate_den,
+            "phase": phase, "reach": label_tc(reach),
+        }
+
+    def _upper_bound(self, label: int) -> int:
+        """Return the number of runs whose start label is <= label."""
+        lo, hi = 0, self.n_runs
+        mm, base, size = self._mm, _HEADER.size, _RECORD.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _LABEL.unpack_from(mm, base + mid * size)[0] <= label:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def lookup_all(self, h: int, m: int, s: int, f: int) -> list[int]:
+        """Return the start sample of every indexed occurrence of a timecode.
+
+        @return: Sample offsets in index order (latest run start first).
+        """
+        label = tc_label(h, m, s, f)
+        found = []
+        i = self._upper_bound(label)
+        while i > 0:
+            i -= 1
+            start, end, reach, rate_den, first, rate_num, phase, fps_type = \
+                _RECORD.unpack_from(self._mm, _HEADER.size + i * _RECORD.size)
+            if reach < label:
+                break
+            if end < label or not tc_is_valid(h, m, s, f, fps_type):
+                continue
+            k = (tc_frame_number(h, m, s, f, fps_type)
+                 - tc_frame_number(*label_tc(start), fps_type))
+            found.append(first + (2 * k * rate_num + phase) // (2 * rate_den))
+        return found
+
+    def lookup(self, h: int, m: int, s: int, f: int) -> int | None:
+        """Return the start sample of a timecode, or None if not indexed.
+
+        If the timecode occurs more than once, the run with the latest start
+        label wins.
+        """
+        found = self.lookup_all(h, m, s, f)
+        return found[0] if found else None
+
+
+# ── Decoding recorded LTC ────────────────────────────────────────────────────
+
+def _peak_level(mags: bytes) -> int:
+    """Return the highest magnitude that PEAK_SHARE of the samples reach."""
+    need = max(1, int(len(mags) * PEAK_SHARE))
+    seen = 0
+    for level in range(127, 0, -1):
+        seen += mags.count(level)
+        if seen >= need:
+            return level
+    return 0
+
+
+def _level_runs(wav: wave.Wave_read, channel: int):
+    """Yield the length of each stretch of samples on one side of the signal.
+
+    A Schmitt trigger on the most significant byte: a sample must pass
+    ±HYSTERESIS of the chunk's peak level to switch sides, so noise around a
+    zero crossing does not split a cell.  Quiet signals (peak under four MSB
+    units) fall back to the plain sign.
+    """
+    width, n_ch = wav.getsampwidth(), wav.getnchannels()
+    levels = _MSB_UNSIGNED if width == 1 else _MSB_SIGNED
+    mag_table = bytes(v if v >= 0 else -v - 1 for v in levels)
+    msb, stride = channel * width + width - 1, width * n_ch
+    carry_side, carry = None, 0
+    while True:
+        data = wav.readframes(DECODE_CHUNK)
+        if not data:
+            break
+        msbs = data[msb::stride]
+        t = int(_peak_level(msbs[::PEAK_STRIDE].translate(mag_table)) * HYSTERESIS)
+        sides = msbs.translate(bytes(0 if v >= t else 1 if v < -t else 2 for v in levels))
+        runs = list(map(len, _RUNS_RE.findall(sides)))
+        last = sides[len(sides) - runs[-1]]
+        if carry and sides[0] in (carry_side, 2):
+            runs[0] += carry            # run continues across the chunk edge
+        elif carry:
+            yield carry
+        if last != 2:
+            carry_side = last
+        carry = runs.pop()              # may continue into the next chunk
+        yield from runs
+    if carry:
+        yield carry
+
+
+def decode_ltc_frames(wav_path: str, channel: int = 0, fps_type: int | None = None):
+    """Decode LTC from a PCM WAV file.
+
+    Zero crossings are found per chunk with bytes.translate and a regex over
+    the side of a hysteresis band each sample is on; runs shorter than a
+    quarter bit are merged away, and the rest classified as half or full bit
+    cells against a running bit-period estimate, so varispeed and drift are
+    tracked.  Silence or dropouts reset the decoder.
+
+    @param wav_path: Path to an 8/16/24/32-bit PCM WAV.
+    @param channel: Zero-based channel carrying LTC.
+    @param fps_type: Force the frame-rate type; default infers it from the
+                     drop-frame flag, the frame numbers and the bit rate.
+    @return: Generator of (first_sample, h, m, s, f, fps_type) per frame.
+    @raise ValueError: If channel does not exist.
+    """
+    with wave.open(wav_path, "rb") as wav:
+        if not 0 <= channel < wav.getnchannels():
+            raise ValueError(f"{wav_path}: no channel {channel}")
+        sample_rate = wav.getframerate()
+        period = sample_rate / 2000.0       # full bit cell at ~25 fps
+        reg = nbits = 0
+        half = False
+        starts = [0] * 80                   # bit start samples, ring buffer
+        pos = bit_start = 0
+        pending, merging = 0, False         # run held back until the next is seen
+        # A final infinite run flushes the pending one
+        for run in chain(_level_runs(wav, channel), (float("inf"),)):
+            if merging:                     # far side of a glitch: same side as pending
+                pending += run
+                merging = False
+                continue
+            if run < 0.25 * period and pending:
+                pending += run              # a glitch splits one cell into three runs
+                merging = True
+                continue
+            length, pending = pending, run
+            at, pos = pos, pos + length
+            if length > 2.0 * period or length < 0.25 * period:
+                nbits, half = 0, False      # silence, dropout or a glitch
+                continue
+            if length < 0.75 * period:      # half cell: two make a 1
+                period += (2 * length - period) * 0.125
+                if not half:
+                    half, bit_start = True, at
+                    continue
+                half, bit = False, 1
+            else:                           # full cell: a 0
+                period += (length - period) * 0.125
+                if half:                    # out of step: resync on the sync word
+                    half, nbits = False, 0
+                bit, bit_start = 0, at
+            reg = (reg >> 1) | (bit << 79)
+            starts[nbits % 80] = bit_start
+            nbits += 1
+            if nbits < 80 or reg >> 64 != SYNC_WORD:
+                continue
+
+            h = ((reg >> 48) & 0xF) + 10 * ((reg >> 56) & 0x3)
+            m = ((reg >> 32) & 0xF) + 10 * ((reg >> 40) & 0x7)
+            s = ((reg >> 16) & 0xF) + 10 * ((reg >> 24) & 0x7)
+            f = (reg & 0xF) + 10 * ((reg >> 8) & 0x3)
+            fps = fps_type
+            if fps is None:
+                if (reg >> 10) & 1:
+                    fps = 2
+                else:
+                    rate = sample_rate / (80.0 * period)
+                    fps = min((t for t in (0, 1, 3) if f < FPS_INT[t]),
+                              key=lambda t: abs(FPS_INT[t] - rate), default=3)
+            if tc_is_valid(h, m, s, f, fps):
+                yield starts[nbits % 80], h, m, s, f, fps
+
+
+def build_index_from_frames(frames, builder: IndexBuilder,
+                            tolerance: float = DEFAULT_TOLERANCE) -> None:
+    """Group decoded frames into runs and add them to builder.
+
+    A run continues while the timecode advances by one frame at the same fps
+    and the line from the run's first frame to the newest one passes within
+    tolerance samples of every frame in between (swing-door fit), so a
+    recording that drifts against its sample clock still folds into one run.
+
+    @param frames: Iterable of (first_sample, h, m, s, f, fps_type).
+    @param builder: Index builder to add runs to.
+    @param tolerance: Allowed deviation of a frame start from its run's line.
+    """
+    run = None      # [tc, fps_type, first, last, n, next_tc, lo, hi]
+
+    def close(r):
+        tc, fps, first, last, n = r[:5]
+        if n > 1:
+            builder.add_run(*tc, fps, n, first, last - first, n - 1)
+        else:
+            num, den = FPS_RATIONAL[fps]
+            builder.add_run(*tc, fps, 1, first, builder.sample_rate * den, num)
+
+    for sample, h, m, s, f, fps in frames:
+        tc = (h, m, s, f)
+        if run is not None and run[1] == fps and run[5] == tc:
+            dx, dy = run[4], sample - run[2]
+            slope = dy / dx
+            if run[6] <= slope <= run[7]:
+                run[3], run[4], run[5] = sample, run[4] + 1, advance_tc(*tc, fps)
+                run[6] = max(run[6], (dy - tolerance) / dx)
+                run[7] = min(run[7], (dy + tolerance) / dx)
+                continue
+        if run is not None:
+            close(run)
+        run = [tc, fps, sample, sample, 1, advance_tc(*tc, fps), float("-inf"), float("inf")]
+    if run is not None:
+        close(run)
+
+
+def build_index_for_wav(wav_path: str, index_path: str | None = None, channel: int = 0,
+                        fps_type: int | None = None,
+                        tolerance: float = DEFAULT_TOLERANCE) -> int:
+    """Decode a recorded LTC WAV and write its sidecar index.
+
+    @param wav_path: Path to the recording.
+    @param index_path: Output path (default: index_path_for(wav_path)).
+    @param channel: Zero-based channel carrying LTC.
+    @param fps_type: Force the frame-rate type (default: infer).
+    @param tolerance: Allowed frame-start deviation within a run, in samples.
+    @return: Number of runs written.
+    """
+    with wave.open(wav_path, "rb") as wav:
+        sample_rate = wav.getframerate()
+    builder = IndexBuilder(sample_rate)
+    build_index_from_frames(decode_ltc_frames(wav_path, channel, fps_type), builder, tolerance)
+    return builder.write(index_path or index_path_for(wav_path))
+
+
+# ── CLI ──────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    """Entry point: build, query or dump an index."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ReaTC LTC timecode → sample index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_build = sub.add_parser("build", help="decode a recorded LTC WAV and write its index")
+    p_build.add_argument("wav_path")
+    p_build.add_argument("index_path", nargs="?")
+    p_build.add_argument("--channel", type=int, default=0, help="zero-based LTC channel")
+    p_build.add_argument("--fps", type=int, choices=range(4), default=None,
+                         help="force fps_type (0=24 1=25 2=29.97DF 3=30)")
+    p_build.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                         help="max frame-start deviation within a run, samples")
+    p_lookup = sub.add_parser("lookup", help="print the sample offset of timecodes")
+    p_lookup.add_argument("index_path")
+    p_lookup.add_argument("timecodes", nargs="+")
+    p_dump = sub.add_parser("dump", help="print every run in an index")
+    p_dump.add_argument("index_path")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "build":
+            runs = build_index_for_wav(args.wav_path, args.index_path, args.channel,
+                                       args.fps, args.tolerance)
+            print(f"{args.index_path or index_path_for(args.wav_path)}: {runs} runs")
+            return
+
+        with LtcIndex(args.index_path) as index:
+            if args.command == "dump":
+                print(f"sample rate {index.sample_rate}, {len(index)} runs")
+                for i in range(len(index)):
+                    run = index.run(i)
+                    print("{:02d}:{:02d}:{:02d}:{:02d}".format(*run["start"]),
+                          "- {:02d}:{:02d}:{:02d}:{:02d}".format(*run["end"]),
+                          f"fps_type {run['fps_type']} @ {run['first_sample']}")
+                return
+
+            missing = False
+            for text in args.timecodes:
+                sample = index.lookup(*parse_tc(text))
+                if sample is None:
+                    print(f"{text}\tnot found")
+                    missing = True
+                else:
+                    print(f"{text}\t{sample}\t{sample / index.sample_rate:.6f}")
+            sys.exit(1 if missing else 0)
+    except (OSError, ValueError, wave.Error) as e:
+        print(f"reatc_ltcindex: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,11 @@
 # Persistent process that reads timecode from stdin and sends OSC packets.
 # Packet built with raw struct — no external library required.
 #
-# Usage: python3 reatc_osc.py <dest_ip> <port> <osc_address>
+# Usage: python3 reatc_osc.py <dest_ip> <port> <osc_address> [options]
+#
+# The options (health status file, profiling, socket QoS, low-jitter mode and
+# multi-producer listen mode) are shared with the other daemon and documented
+# in reatc_daemon.py and reatc_profile.py; --help lists them all.
 #
 # Stdin protocol (one line per packet, space-separated integers):
 #   <hours> <mins> <secs> <frames> <tc_type>
@@ -34,9 +38,17 @@ from __future__ import annotations
 
 __version__ = "{{VERSION}}"
 
+import argparse
 import sys
 import socket
 import struct
+from time import perf_counter_ns
+
+from reatc_daemon import DaemonSession, add_daemon_args, freeze_gc, tc_in_range
+
+
+# The five int32 arguments at the end of the message
+_TC_ARGS = struct.Struct(">iiiii")
 
 
 def osc_string(s: str) -> bytes:
@@ -70,20 +82,34 @@ def build_osc_timecode(address: str, hours: int, mins: int, secs: int, frames: i
 
 def main() -> None:
     """Entry point: read timecode lines from stdin and send OSC UDP packets."""
-    if len(sys.argv) < 4:
-        print("Usage: reatc_osc.py <dest_ip> <port> <osc_address>", file=sys.stderr)
-        sys.exit(1)
-
-    dest_ip     = sys.argv[1]
-    port        = int(sys.argv[2])
-    osc_address = sys.argv[3]
+    parser = argparse.ArgumentParser(prog="reatc_osc.py")
+    parser.add_argument("dest_ip")
+    parser.add_argument("port", type=int)
+    parser.add_argument("osc_address")
+    add_daemon_args(parser)
+    args = parser.parse_args()
+
+    dest_ip     = args.dest_ip
+    port        = args.port
+    osc_address = args.osc_address
+
+    # Packet buffer and destination are allocated once; the loop patches the
+    # int32 arguments in place
+    packet = bytearray(build_osc_timecode(osc_address, 0, 0, 0, 0, 0))
+    args_at = len(packet) - _TC_ARGS.size
+    dest = (dest_ip, port)
 
     # Create socket once at startup (avoid per-packet overhead)
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    session = DaemonSession("osc", parser, args, sock)
+    stats = session.stats
+    freeze_after = session.freeze_after
+    jitter = stats.jitter
 
     try:
-        # Read lines from stdin until EOF
-        for line in sys.stdin:
+        # Read lines until EOF on stdin (or until signalled in listen mode)
+        for line in session.source:
+            t_read = stats.last_read_ns = perf_counter_ns()
             line = line.strip()
             if not line:
                 continue
@@ -91,6 +117,7 @@ def main() -> None:
             try:
                 parts = line.split()
                 if len(parts) < 5:
+                    stats.parse_failed(f"malformed line: {line!r}")
                     print(f"osc: malformed line (need 5 fields): {line!r}", file=sys.stderr)
                     continue
 
@@ -100,16 +127,24 @@ def main() -> None:
                 frames  = int(parts[3])
                 tc_type = int(parts[4])
 
-                if not (0 <= hours <= 39 and 0 <= mins <= 59
-                        and 0 <= secs <= 59 and 0 <= frames <= 29
-                        and 0 <= tc_type <= 3):
+                if not tc_in_range(hours, mins, secs, frames, tc_type):
+                    stats.parse_failed(f"TC out of range: {line!r}")
                     print(f"osc: TC out of range: {line!r}", file=sys.stderr)
                     continue
 
-                packet = build_osc_timecode(osc_address, hours, mins, secs, frames, tc_type)
-                sock.sendto(packet, (dest_ip, port))
+                _TC_ARGS.pack_into(packet, args_at, hours, mins, secs, frames, tc_type)
+                try:
+                    sock.sendto(packet, dest)
+                    stats.packets_sent += 1
+                    jitter.tick(t_read, perf_counter_ns())
+                    if stats.packets_sent == freeze_after:
+                        stats.realtime["gc"] = freeze_gc()
+                except OSError as e:
+                    # Stay alive on transient network errors; reported via --status
+                    stats.send_failed(e)
 
             except (ValueError, IndexError):
+                stats.parse_failed(f"parse error: {line!r}")
                 print(f"osc: parse error: {line!r}", file=sys.stderr)
                 continue
 
@@ -119,6 +154,7 @@ def main() -> None:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
     finally:
+        session.close()
         sock.close()
 
 
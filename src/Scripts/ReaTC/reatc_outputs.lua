@@ -5,7 +5,8 @@
 -- Each daemon is an `io.popen("w")` process that reads TC lines from stdin and sends
 -- UDP packets. Daemons are started lazily (or pre-started via `prestart_daemons`),
 -- throttled to match the active framerate, and automatically restarted up to 3 times
--- on write failure before disabling the output.
+-- on write failure before disabling the output. Each daemon also rewrites a small
+-- status file (`--status`) that `poll_health` reads at a low rate for the UI.
 -- @module reatc_outputs
 -- @noindex
 -- @version {{VERSION}}
@@ -18,12 +19,37 @@ return function(core)
   local MAX_RETRIES = 3
   local RETRY_BACKOFF = { 0.5, 1.0, 2.0 }  -- seconds between retries
 
+  -- Health polling: status files are read at most this often (seconds), and a
+  -- heartbeat older than HEALTH_STALE means the process is dead or frozen.
+  -- Input waiting while the send loop has not read for HEALTH_STALE means the
+  -- loop is stuck even though the heartbeat thread still ticks. A break of
+  -- more than HEALTH_POLL between frame writes ends a run of writes.
+  local HEALTH_POLL  = 0.5
+  local HEALTH_STALE = 3.0
+  local last_health_poll = 0
+
   -- Per-daemon retry state
   s.osc_retries    = 0
   s.osc_retry_at   = 0
   s.artnet_retries = 0
   s.artnet_retry_at = 0
 
+  -- Per-daemon start time and frame-write runs, for health without a status file
+  -- or a queue depth (time_precise seconds)
+  s.osc_started_at       = 0
+  s.osc_writing_since    = 0
+  s.osc_last_write       = 0
+  s.artnet_started_at    = 0
+  s.artnet_writing_since = 0
+  s.artnet_last_write    = 0
+
+  --- Socket and scheduling options shared by both daemon command lines.
+  -- @return string extra arguments (empty when all are defaults)
+  local function socket_args()
+    return (s.net_dscp ~= "" and (" --dscp " .. s.net_dscp) or "")
+        .. (s.net_realtime and " --realtime" or "")
+  end
+
   -- ── OSC daemon ───────────────────────────────────────────────────────────
 
   --- Launch the OSC Python daemon subprocess.
@@ -35,11 +61,14 @@ return function(core)
     end
     local q = core.is_win and ('"' .. s.python_bin .. '"') or s.python_bin
     local cmd = q .. ' "' .. core.py_osc .. '" "' .. s.osc_ip .. '" '
-                .. s.osc_port .. ' "' .. s.osc_address .. '" ' .. core.dev_null
+                .. s.osc_port .. ' "' .. s.osc_address .. '"'
+                .. ' --status "' .. core.osc_status_path .. '"'
+                .. socket_args() .. ' ' .. core.dev_null
     s.osc_proc = io.popen(cmd, "w")
     if not s.osc_proc then
       s.osc_error = "Failed to start OSC daemon"; return false
     end
+    s.osc_started_at = reaper.time_precise()
     s.osc_error = nil
     s.osc_retries = 0
     return true
@@ -51,6 +80,8 @@ return function(core)
       pcall(function() s.osc_proc:close() end)
       s.osc_proc = nil
     end
+    os.remove(core.osc_status_path)
+    s.osc_health = nil
   end
 
   --- Send current TC to the OSC daemon (throttled, with retry on failure).
@@ -94,6 +125,8 @@ return function(core)
       end
     else
       s.osc_packets_sent = s.osc_packets_sent + 1
+      if now - s.osc_last_write > HEALTH_POLL then s.osc_writing_since = now end
+      s.osc_last_write = now
       s.osc_error = nil
       s.osc_retries = 0
     end
@@ -109,11 +142,14 @@ return function(core)
       s.artnet_error = "Python not found"; return false
     end
     local q = core.is_win and ('"' .. s.python_bin .. '"') or s.python_bin
-    local cmd = q .. ' "' .. core.py_artnet .. '" "' .. s.dest_ip .. '" ' .. core.dev_null
+    local cmd = q .. ' "' .. core.py_artnet .. '" "' .. s.dest_ip .. '"'
+                .. ' --status "' .. core.artnet_status_path .. '"'
+                .. socket_args() .. ' ' .. core.dev_null
     s.artnet_proc = io.popen(cmd, "w")
     if not s.artnet_proc then
       s.artnet_error = "Failed to start Art-Net daemon"; return false
     end
+    s.artnet_started_at = reaper.time_precise()
     s.artnet_error = nil
     s.artnet_retries = 0
     return true
@@ -125,6 +161,8 @@ return function(core)
       pcall(function() s.artnet_proc:close() end)
       s.artnet_proc = nil
     end
+    os.remove(core.artnet_status_path)
+    s.artnet_health = nil
   end
 
   --- Send current TC to the Art-Net daemon (throttled, with retry on failure).
@@ -168,11 +206,72 @@ return function(core)
       end
     else
       s.packets_sent = s.packets_sent + 1
+      if now - s.artnet_last_write > HEALTH_POLL then s.artnet_writing_since = now end
+      s.artnet_last_write = now
       s.artnet_error = nil
       s.artnet_retries = 0
     end
   end
 
+  -- ── Health ───────────────────────────────────────────────────────────────
+
+  --- Parse a daemon status file into a table.
+  -- @param path string status file path
+  -- @return table|nil fields (numbers where numeric), or nil if unreadable
+  local function read_status(path)
+    local fh = io.open(path, "r")
+    if not fh then return nil end
+    local h = {}
+    for line in fh:lines() do
+      local k, v = line:match("^([%w_]+)=(.*)$")
+      if k then h[k] = tonumber(v) or v end
+    end
+    fh:close()
+    if not h.heartbeat then return nil end
+    return h
+  end
+
+  --- Refresh `artnet_health` / `osc_health` from the daemons' status files.
+  -- Cheap to call every defer cycle: rate-limited to HEALTH_POLL and never
+  -- touches the send path. Sets `.stale = true` when the heartbeat stops,
+  -- `.stalled = true` when waiting input is not being read, and
+  -- `.unknown = true` while a running daemon has written no status yet.
+  function M.poll_health()
+    local now = reaper.time_precise()
+    if now - last_health_poll < HEALTH_POLL then return end
+    last_health_poll = now
+
+    local wall = os.time()
+    local function refresh(proc, path, prev, started, writing_since, last_write)
+      if not proc then return nil end
+      local h = read_status(path)
+      if not h and prev and not prev.unknown then
+        h = prev  -- keep last reading if mid-rename
+      end
+      if not h then
+        -- Still starting, or the daemon exited before its first status write
+        return { unknown = true, stale = now - started > HEALTH_STALE }
+      end
+      h.stale = wall - h.heartbeat > HEALTH_STALE
+      local waiting
+      if (h.queue_depth or -1) >= 0 then
+        waiting = h.queue_depth > 0
+      else
+        -- No queue depth (Windows): input is waiting when Lua has kept writing
+        -- frames for longer than the loop has gone without reading one (plus
+        -- one status interval, as the reading can be that old)
+        waiting = now - last_write < HEALTH_POLL
+                  and now - writing_since > (h.progress_age or 0) + 1
+      end
+      h.stalled = waiting and (h.progress_age or 0) > HEALTH_STALE
+      return h
+    end
+    s.artnet_health = refresh(s.artnet_proc, core.artnet_status_path, s.artnet_health,
+                              s.artnet_started_at, s.artnet_writing_since, s.artnet_last_write)
+    s.osc_health    = refresh(s.osc_proc, core.osc_status_path, s.osc_health,
+                              s.osc_started_at, s.osc_writing_since, s.osc_last_write)
+  end
+
   -- ── Pre-start ────────────────────────────────────────────────────────────
 
   --- Pre-start enabled daemons to avoid first-packet latency.
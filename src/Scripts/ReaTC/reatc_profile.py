@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# ReaTC — https://github.com/paskateknikko/ReaTC
+# Copyright (c) 2025 Tuukka Aimasmäki. MIT License — see LICENSE.
+#
+# Opt-in profiling for reatc_ltcgen.py, reatc_artnet.py and reatc_osc.py.
+# Standard library only; nothing is imported or measured unless enabled.
+#
+# Enable with a CLI flag or environment variable (the flag wins):
+#   --profile=cpu,mem        REATC_PROFILE=cpu,mem    (cpu = cProfile,
+#                                                     mem = tracemalloc,
+#                                                     1 = cpu)
+#   --profile-dir=<dir>      REATC_PROFILE_DIR=<dir>  (default: system temp dir)
+#   (either flag also accepts its value as the next argument; argparse CLIs
+#   get both from add_profile_args, hand-parsed ones from pop_profile_args)
+#                            REATC_PROFILE_TOP=<n>    (default: 25 rows)
+#
+# At exit the profiled script writes to <dir>:
+#   <name>-<pid>.pstats  cProfile dump (open with `python3 -m pstats`)
+#   <name>-<pid>.txt     top-N functions, top-N allocation sites, peak memory,
+#                        wall/CPU time and the script's hot-path counters
+#
+# @noindex
+# @version {{VERSION}}
+
+from __future__ import annotations
+
+__version__ = "{{VERSION}}"
+
+import atexit
+import io
+import os
+import sys
+import tempfile
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import argparse
+
+PROFILE_MODES = ("cpu", "mem")
+DEFAULT_TOP = 25
+
+
+def parse_modes(spec: str | None) -> tuple[str, ...]:
+    """Turn "cpu,mem" / "1" / "" into a tuple of enabled modes.
+
+    @param spec: Comma-separated modes, "1" for cpu, or None/"" for off.
+    @return: Enabled modes (subset of PROFILE_MODES).
+    @raise ValueError: On an unknown mode.
+    """
+    if not spec or spec == "0":
+        return ()
+    if spec == "1":
+        return ("cpu",)
+    modes = tuple(m.strip() for m in spec.split(",") if m.strip())
+    for mode in modes:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"unknown profile mode {mode!r} (use {','.join(PROFILE_MODES)})")
+    return modes
+
+
+def pop_profile_args(argv: list[str]) -> tuple[str | None, str | None]:
+    """Remove --profile / --profile-dir from argv (for hand-parsed CLIs).
+
+    Accepts both "--profile=cpu" and "--profile cpu", like argparse.
+
+    @param argv: Argument list, modified in place.
+    @return: Tuple of (modes spec, output dir), None where not given.
+    @raise ValueError: If a flag is missing its value.
+    """
+    found = {"--profile": None, "--profile-dir": None}
+    rest = []
+    args = iter(argv)
+    for arg in args:
+        name, eq, value = arg.partition("=")
+        if name not in found:
+            rest.append(arg)
+            continue
+        if not eq:
+            value = next(args, None)
+            if value is None:
+                raise ValueError(f"{name} needs a value")
+        found[name] = value
+    argv[:] = rest
+    return found["--profile"], found["--profile-dir"]
+
+
+def add_profile_args(parser: argparse.ArgumentParser) -> None:
+    """Add the --profile/--profile-dir options (for argparse CLIs).
+
+    @param parser: Parser to extend; pass args.profile and args.profile_dir
+                   to start_profiling().
+    """
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", metavar="MODES",
+                       help="profile this run: cpu, mem or cpu,mem (default: $REATC_PROFILE)")
+    group.add_argument("--profile-dir", metavar="DIR",
+                       help="profile report directory (default: $REATC_PROFILE_DIR or temp)")
+
+
+class Profiler:
+    """cProfile/tracemalloc session that writes a report when stopped."""
+
+    def __init__(self, name: str, modes: tuple[str, ...], out_dir: str, top: int = DEFAULT_TOP) -> None:
+        """Create (but do not start) a profiler.
+
+        @param name: Report file prefix (e.g. "artnet").
+        @param modes: Enabled modes from parse_modes().
+        @param out_dir: Directory for the report files (created if missing).
+        @param top: Rows in each top-N table.
+        """
+        self.name = name
+        self.modes = modes
+        self.out_dir = out_dir
+        self.top = top
+        self.counters: dict[str, int] = {}
+        self._counter_sources = []
+        self._profile = None
+        self._stopped = False
+        self._t0 = self._cpu0 = 0.0
+
+    def add_counters(self, source) -> None:
+        """Register a callable returning a dict of counters, read once at stop().
+
+        Lets scripts expose hot-path counters they already keep without any
+        extra work per packet or frame.
+        """
+        self._counter_sources.append(source)
+
+    def start(self) -> None:
+        """Begin profiling and arrange for stop() at interpreter exit."""
+        self._t0, self._cpu0 = time.perf_counter(), time.process_time()
+        if "mem" in self.modes:
+            import tracemalloc
+            tracemalloc.start()
+        if "cpu" in self.modes:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        atexit.register(self.stop)
+
+    def stop(self) -> list[str]:
+        """Stop profiling and write the report (idempotent).
+
+        @return: Paths of the files written.
+        """
+        if self._stopped:
+            return []
+        self._stopped = True
+        if self._profile is not None:
+            self._profile.disable()
+
+        wall = time.perf_counter() - self._t0
+        cpu = time.process_time() - self._cpu0
+        for source in self._counter_sources:
+            self.counters.update(source())
+
+        os.makedirs(self.out_dir, exist_ok=True)
+        base = os.path.join(self.out_dir, f"{self.name}-{os.getpid()}")
+        written = []
+        out = io.StringIO()
+        out.write(f"ReaTC profile: {self.name} (pid {os.getpid()})\n")
+        out.write(f"modes: {','.join(self.modes)}\n")
+        out.write(f"wall: {wall:.3f} s  cpu: {cpu:.3f} s\n\n")
+
+        if self.counters:
+            out.write("counters:\n")
+            for key in sorted(self.counters):
+                out.write(f"  {key:<20} {self.counters[key]}\n")
+            out.write("\n")
+
+        if self._profile is not None:
+            import pstats
+            self._profile.dump_stats(base + ".pstats")
+            written.append(base + ".pstats")
+            out.write(f"top {self.top} functions by cumulative time:\n")
+            pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(self.top)
+
+        if "mem" in self.modes:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                out.write(f"memory: current {current / 1024:.1f} KiB  peak {peak / 1024:.1f} KiB\n")
+                out.write(f"top {self.top} allocation sites:\n")
+                for stat in snapshot.statistics("lineno")[:self.top]:
+                    out.write(f"  {stat}\n")
+
+        with open(base + ".txt", "w", encoding="utf-8") as fh:
+            fh.write(out.getvalue())
+        written.append(base + ".txt")
+        return written
+
+
+def start_profiling(name: str, modes: str | None = None, out_dir: str | None = None) -> Profiler | None:
+    """Start a Profiler if enabled by arguments or REATC_PROFILE*, else do nothing.
+
+    @param name: Report file prefix.
+    @param modes: Modes spec from the CLI (overrides REATC_PROFILE).
+    @param out_dir: Report directory from the CLI (overrides REATC_PROFILE_DIR).
+    @return: The running Profiler, or None when profiling is off.
+    @raise ValueError: On an unknown mode in modes (a bad REATC_PROFILE only
+                       prints a warning, so it cannot stop a daemon).
+    """
+    if modes is not None:
+        enabled = parse_modes(modes)
+    else:
+        try:
+            enabled = parse_modes(os.environ.get("REATC_PROFILE"))
+        except ValueError as e:
+            print(f"{name}: ignoring REATC_PROFILE: {e}", file=sys.stderr)
+            return None
+    if not enabled:
+        return None
+    out_dir = out_dir or os.environ.get("REATC_PROFILE_DIR") or tempfile.gettempdir()
+    try:
+        top = int(os.environ.get("REATC_PROFILE_TOP", DEFAULT_TOP))
+    except ValueError:
+        top = DEFAULT_TOP
+    profiler = Profiler(name, enabled, out_dir, top)
+    profiler.start()
+    print(f"{name}: profiling ({','.join(enabled)}) → {out_dir}", file=sys.stderr)
+    return profiler
@@ -2,6 +2,7 @@
 -- Copyright (c) 2025 Tuukka Aimasmäki. MIT License — see LICENSE.
 --
 -- Standalone script: Regions to LTC — generate LTC audio items from project regions
+-- (one item per region, or one continuous item for all selected regions)
 -- @noindex
 -- @version {{VERSION}}
 
@@ -29,6 +30,10 @@ local ImGui = require 'imgui' '0.9'
 local FPS_NAMES  = core.FR_NAMES
 local FPS_COUNT  = #FPS_NAMES
 
+-- Gap fill modes for single-file rendering (index matches the combo, 1-based)
+local GAP_FILLS      = { "silence", "freerun" }
+local GAP_FILL_NAMES = { "Silence", "Free-run" }
+
 local py_ltcgen = script_path .. "reatc_ltcgen.py"
 
 -- ── State ──────────────────────────────────────────────────────────────────
@@ -39,6 +44,10 @@ local state = {
   file_template = "{name}_{fps}",
   level_dbfs    = -6,
   bulk_fps_type = 1,  -- default 25fps (EBU), 1-based for combo
+  single_file   = false,  -- one continuous file + item for all selected regions
+  gap_fill      = 1,      -- index into GAP_FILLS
+  shaped_edges  = false,  -- SMPTE 12M rise-time edges instead of square
+  write_index   = true,   -- .ltcidx TC -> sample sidecar next to each WAV
 }
 
 -- ── Colors ─────────────────────────────────────────────────────────────────
@@ -120,6 +129,18 @@ local function safe_filename(str, max_len)
   return str:gsub('[^%w%-_ ]', '_'):sub(1, max_len or 40)
 end
 
+--- First "<base>.wav", "<base>_2.wav", ... in dir that does not exist yet, so
+-- a new bake never overwrites media (and its .ltcidx) that earlier items use.
+local function unused_wav_path(dir, sep, base)
+  local path = dir .. sep .. base .. ".wav"
+  local n = 1
+  while reaper.file_exists(path) do
+    n = n + 1
+    path = string.format("%s%s%s_%d.wav", dir, sep, base, n)
+  end
+  return path
+end
+
 local function format_filename(template, rgn)
   local fps_name = FPS_NAMES[rgn.fps_type] or "25fps"
   local tc_str = string.format("%02d%02d%02d%02d", rgn.tc_h, rgn.tc_m, rgn.tc_s, rgn.tc_f)
@@ -158,14 +179,41 @@ local function count_selected()
   return n
 end
 
-local function parse_tc_string(str, fps_max)
+--- Parse "HH:MM:SS:FF" typed into a region row.
+-- Accepts the same labels as reatc_ltcgen.tc_is_valid, so per-region and
+-- single-file bakes agree on what is valid.
+-- @return h, m, s, f on success, or nil and a reason
+local function parse_tc_string(str, fps_type)
   local h, m, s, f = str:match("^(%d%d):(%d%d):(%d%d):(%d%d)$")
-  if not h then return nil end
+  if not h then return nil, "start TC must be HH:MM:SS:FF" end
   h, m, s, f = tonumber(h), tonumber(m), tonumber(s), tonumber(f)
-  if h > 39 or m > 59 or s > 59 or f >= fps_max then return nil end
+  local fps_max = core.FPS_INT[fps_type] or 30
+  if h > 23 or m > 59 or s > 59 or f >= fps_max then
+    return nil, string.format("start TC out of range (hours 00-23, frames 00-%02d)", fps_max - 1)
+  end
+  if fps_type - 1 == core.FR_DF and s == 0 and f < 2 and m % 10 ~= 0 then
+    return nil, "frames 00-01 are dropped at this minute in 29.97DF"
+  end
   return h, m, s, f
 end
 
+--- Reason a region's start TC cannot be baked, or nil if it is valid.
+local function tc_problem(rgn)
+  local h, reason = parse_tc_string(rgn.tc_str, rgn.fps_type)
+  if not h then return reason end
+  return nil
+end
+
+--- Run a reatc_ltcgen.py command, keeping its output for error reports.
+-- @return boolean success, string output (trimmed, may be empty)
+local function run_ltcgen(cmd)
+  local h = io.popen(cmd .. " 2>&1")
+  if not h then return false, "" end
+  local out = h:read("*a") or ""
+  local ok = h:close()
+  return ok == true, (out:gsub("%s+$", ""))
+end
+
 local function clamp_frame(rgn)
   local fps_max = core.FPS_INT[rgn.fps_type] or 30
   if rgn.tc_f >= fps_max then
@@ -183,6 +231,51 @@ local python_bin = core.find_python()
 
 -- ── Generation ─────────────────────────────────────────────────────────────
 
+--- Render all selected regions into one continuous WAV and add a single item.
+-- The segment list is handed to reatc_ltcgen.py, which fills gaps with silence
+-- or free-running code and switches TC at each region start in one pass.
+-- @return boolean success, string|nil error
+local function generate_single_file(selected, ltc_dir, sep, sample_rate, amplitude, q, track)
+  table.sort(selected, function(a, b) return a.pos < b.pos end)
+  local first, last = selected[1], selected[#selected]
+
+  local base     = safe_filename(state.track_name ~= "" and state.track_name or "LTC")
+  local seg_path = ltc_dir .. sep .. base .. "_segments.txt"
+  local wav_path = unused_wav_path(ltc_dir, sep, base)
+
+  local fh = io.open(seg_path, "w")
+  if not fh then return false, "cannot write " .. seg_path end
+  fh:write("# pos h m s f fps_type duration\n")
+  for _, rgn in ipairs(selected) do
+    fh:write(string.format("%.10f %d %d %d %d %d %.10f\n",
+      rgn.pos, rgn.tc_h, rgn.tc_m, rgn.tc_s, rgn.tc_f,
+      rgn.fps_type - 1, rgn.endpos - rgn.pos))
+  end
+  fh:close()
+
+  local cmd = string.format('%s "%s" --segments "%s" %d "%s" %d %s%s%s',
+    q, py_ltcgen, seg_path, sample_rate, wav_path, amplitude,
+    GAP_FILLS[state.gap_fill] or "silence",
+    state.shaped_edges and " --shaped" or "",
+    state.write_index and " --index" or "")
+  local gen_ok, gen_out = run_ltcgen(cmd)
+  os.remove(seg_path)
+  if not gen_ok then
+    return false, gen_out ~= "" and gen_out or "generation failed"
+  end
+
+  local src = reaper.PCM_Source_CreateFromFile(wav_path)
+  if not src then return false, "cannot load " .. wav_path end
+  local item = reaper.AddMediaItemToTrack(track)
+  reaper.SetMediaItemPosition(item, first.pos, false)
+  reaper.SetMediaItemLength(item, last.endpos - first.pos, false)
+  local take = reaper.AddTakeToMediaItem(item)
+  reaper.SetMediaItemTake_Source(take, src)
+  reaper.GetSetMediaItemTakeInfo_String(take, "P_NAME",
+    string.format("LTC — %d regions", #selected), true)
+  return true
+end
+
 local function generate_selected()
   if not python_bin then
     reaper.MB(
@@ -207,6 +300,20 @@ local function generate_selected()
   end
   if #selected == 0 then return end
 
+  local bad = {}
+  for _, rgn in ipairs(selected) do
+    local reason = tc_problem(rgn)
+    if reason then
+      local name = rgn.name ~= "" and rgn.name or ("Region " .. rgn.index)
+      bad[#bad + 1] = string.format("%s (%s): %s", name, rgn.tc_str, reason)
+    end
+  end
+  if #bad > 0 then
+    reaper.MB("Fix the start TC of these regions before baking:\n\n" ..
+      table.concat(bad, "\n"), "ReaTC — Bake LTC", 0)
+    return
+  end
+
   local sep     = core.is_win and "\\" or "/"
   local ltc_dir = proj_path .. sep .. "ReaTC_LTC"
 
@@ -231,6 +338,27 @@ local function generate_selected()
   local q = core.is_win and ('"' .. python_bin .. '"') or python_bin
 
   local track    = get_or_create_track(state.track_name)
+
+  if state.single_file then
+    reaper.Undo_BeginBlock()
+    local ok, err = generate_single_file(selected, ltc_dir, sep, sample_rate, amplitude, q, track)
+    reaper.Undo_EndBlock("ReaTC: Bake LTC from regions", -1)
+    reaper.UpdateArrange()
+    if ok then
+      reaper.MB(
+        string.format(
+          "Done! Added one LTC item covering %d region(s) to track '%s'.\n\nFiles: %s",
+          #selected, state.track_name, ltc_dir),
+        "ReaTC — Bake LTC", 0)
+    else
+      reaper.MB(
+        "Single-file bake failed: " .. err .. "\n\n" ..
+        "Make sure Python 3 is accessible and the project folder is writable.",
+        "ReaTC — Bake LTC", 0)
+    end
+    return
+  end
+
   local ok_count = 0
   local err_list = {}
 
@@ -258,16 +386,18 @@ local function generate_selected()
 
     local wav_path = ltc_dir .. sep .. safe_filename(fname) .. ".wav"
 
-    local cmd = string.format('%s "%s" %d %d %d %d %d %d %d "%s" %d %s',
+    local cmd = string.format('%s "%s" %d %d %d %d %d %d %d "%s" %d%s%s',
       q, py_ltcgen,
       fr_type, rgn.tc_h, rgn.tc_m, rgn.tc_s, rgn.tc_f,
       n_frames, sample_rate,
       wav_path, amplitude,
-      core.dev_null)
+      state.shaped_edges and " --shaped" or "",
+      state.write_index and " --index" or "")
 
-    local gen_ok = os.execute(cmd)
-    if gen_ok == nil or gen_ok == false then
-      err_list[#err_list + 1] = fname .. " (generation failed)"
+    local gen_ok, gen_out = run_ltcgen(cmd)
+    if not gen_ok then
+      err_list[#err_list + 1] = fname .. " (" ..
+        (gen_out ~= "" and gen_out:match("[^\n]*$") or "generation failed") .. ")"
       goto continue_region
     end
 
@@ -368,7 +498,7 @@ local function draw_ui()
 
     -- Reserve space for bottom controls
     local _, avail_y = ImGui.GetContentRegionAvail(ctx)
-    local table_h = math.max(100, avail_y - 140)
+    local table_h = math.max(100, avail_y - 165)
 
     if ImGui.BeginTable(ctx, 'regions', 4, table_flags, 0, table_h) then
       ImGui.TableSetupColumn(ctx, ' ',           ImGui.TableColumnFlags_WidthFixed, 30)
@@ -393,10 +523,12 @@ local function draw_ui()
         -- TC Start
         ImGui.TableSetColumnIndex(ctx, 2)
         ImGui.SetNextItemWidth(ctx, -1)
+        local tc_bad = tc_problem(rgn) ~= nil
+        if tc_bad then ImGui.PushStyleColor(ctx, ImGui.Col_Text, C.red) end
         local tc_changed, tc_new = ImGui.InputText(ctx, '##tc' .. i, rgn.tc_str)
+        if tc_bad then ImGui.PopStyleColor(ctx) end
         if tc_changed then
-          local fps_max = core.FPS_INT[rgn.fps_type] or 30
-          local h, m, s, f = parse_tc_string(tc_new, fps_max)
+          local h, m, s, f = parse_tc_string(tc_new, rgn.fps_type)
           if h then
             rgn.tc_h = h; rgn.tc_m = m; rgn.tc_s = s; rgn.tc_f = f
             rgn.tc_str = string.format("%02d:%02d:%02d:%02d", h, m, s, f)
@@ -443,6 +575,24 @@ local function draw_ui()
   local lvl_changed, lvl_new = ImGui.SliderInt(ctx, '##level', state.level_dbfs, -48, 0,
     '%d dBFS')
   if lvl_changed then state.level_dbfs = lvl_new end
+  ImGui.SameLine(ctx, 0, 16)
+  local shp_changed, shp_new = ImGui.Checkbox(ctx, 'Shaped edges (25 \u{00B5}s)', state.shaped_edges)
+  if shp_changed then state.shaped_edges = shp_new end
+
+  local one_changed, one_new = ImGui.Checkbox(ctx, 'One continuous file', state.single_file)
+  if one_changed then state.single_file = one_new end
+  if state.single_file then
+    ImGui.SameLine(ctx, 0, 16)
+    ImGui.TextColored(ctx, C.dim, "Gaps:")
+    ImGui.SameLine(ctx)
+    ImGui.SetNextItemWidth(ctx, 110)
+    local gap_changed, gap_new = ImGui.Combo(ctx, '##gap_fill', state.gap_fill - 1,
+      table.concat(GAP_FILL_NAMES, '\0') .. '\0')
+    if gap_changed then state.gap_fill = gap_new + 1 end
+  end
+
+  local idx_changed, idx_new = ImGui.Checkbox(ctx, 'Write TC index (.ltcidx)', state.write_index)
+  if idx_changed then state.write_index = idx_new end
 
   -- ── Generate button ──────────────────────────────────────────────────
   ImGui.Spacing(ctx)
@@ -156,6 +156,39 @@ return function(core, outputs)
     ImGui.TextColored(ctx, C.dim, "v" .. core.VERSION)
   end
 
+  --- Draw one line of daemon health from its status file.
+  -- @param h table|nil health table from outputs.poll_health
+  local function draw_health(h)
+    if not h then return end
+    if h.unknown then
+      if h.stale then
+        ImGui.TextColored(ctx, C.red, "Daemon health unknown: no status written (exited at start?)")
+      else
+        ImGui.TextColored(ctx, C.dim, "Daemon health unknown: waiting for first status")
+      end
+    elseif h.stale then
+      ImGui.TextColored(ctx, C.red, "Daemon not responding (no heartbeat)")
+    elseif h.stalled then
+      ImGui.TextColored(ctx, C.red,
+        string.format("Daemon stalled: input not read for %.0f s", h.progress_age))
+    elseif (h.send_errors or 0) > 0 then
+      ImGui.TextColored(ctx, C.orange,
+        string.format("Daemon: %d sent, %d send errors \u{2014} %s",
+          h.packets_sent or 0, h.send_errors, trunc(tostring(h.last_error or ""), 40)))
+    else
+      ImGui.TextColored(ctx, C.dim,
+        string.format("Daemon: %d sent, %d parse errors, queue %d B%s",
+          h.packets_sent or 0, h.parse_errors or 0, math.max(0, h.queue_depth or 0),
+          h.sock_dscp and (", DSCP " .. tostring(h.sock_dscp)) or ""))
+      if (h.ipi_mean_us or 0) > 0 then
+        ImGui.TextColored(ctx, C.dim,
+          string.format("Interval %.1f ms, jitter %.2f ms (max %.1f ms)%s",
+            h.ipi_mean_us / 1000, (h.ipi_jitter_us or 0) / 1000, (h.ipi_max_us or 0) / 1000,
+            h.rt_sched and (", " .. tostring(h.rt_sched)) or ""))
+      end
+    end
+  end
+
   -- ── Settings content (rendered inside popup modal) ──────────────────────────
 
   local function draw_settings()
@@ -195,6 +228,7 @@ return function(core, outputs)
     elseif s.artnet_enabled and s.artnet_proc then
       ImGui.TextColored(ctx, C.green,
         string.format("Running \u{2014} %d packets sent", s.packets_sent))
+      draw_health(s.artnet_health)
     elseif s.artnet_enabled and not s.tc_valid then
       ImGui.TextColored(ctx, C.orange, "Waiting for valid TC")
     elseif s.python_bin then
@@ -258,6 +292,7 @@ return function(core, outputs)
       ImGui.TextColored(ctx, C.green,
         string.format("Running \u{2014} %d packets to %s:%d  %s",
           s.osc_packets_sent, s.osc_ip, s.osc_port, s.osc_address))
+      draw_health(s.osc_health)
     elseif s.osc_enabled and not s.tc_valid then
       ImGui.TextColored(ctx, C.orange, "Waiting for valid TC")
     elseif s.osc_enabled then
@@ -265,6 +300,34 @@ return function(core, outputs)
         string.format("Sending to %s:%d  %s", s.osc_ip, s.osc_port, s.osc_address))
     end
 
+    -- ── Network ──────────────────────────────────────────────────────────────
+    ImGui.SeparatorText(ctx, 'Network')
+    ImGui.TextColored(ctx, C.dim, "Traffic class so managed switches can prioritise timecode")
+
+    local dscp_idx = 0
+    for i, class in ipairs(core.DSCP_CLASSES) do
+      if class == s.net_dscp then dscp_idx = i - 1 end
+    end
+    ImGui.SetNextItemWidth(ctx, 180)
+    local dscp_changed, dscp_new = ImGui.Combo(ctx, 'DSCP##net', dscp_idx,
+      table.concat(core.DSCP_NAMES, '\0') .. '\0')
+    if dscp_changed then
+      s.net_dscp = core.DSCP_CLASSES[dscp_new + 1]
+      core.save_settings()
+      outputs.stop_artnet_daemon()
+      outputs.stop_osc_daemon()
+    end
+
+    local rt_changed, rt_new = ImGui.Checkbox(ctx, 'Low-jitter mode##net', s.net_realtime)
+    if rt_changed then
+      s.net_realtime = rt_new
+      core.save_settings()
+      outputs.stop_artnet_daemon()
+      outputs.stop_osc_daemon()
+    end
+    ImGui.SameLine(ctx)
+    ImGui.TextColored(ctx, C.dim, "raised priority where allowed, no GC pauses")
+
     -- ── Timecode ─────────────────────────────────────────────────────────────
     ImGui.SeparatorText(ctx, 'Timecode')
 
@@ -1,9 +1,18 @@
 """Tests for build system (build.py, verify.py)."""
 
+import os
+import shutil
+import subprocess
+import sys
 import tempfile
 from pathlib import Path
 
-from build import substitute_version, read_changelog_for_version
+import pytest
+
+from build import (
+    substitute_version, read_changelog_for_version,
+    write_if_changed, load_manifest, save_manifest, content_hash,
+)
 
 
 class TestSubstituteVersion:
@@ -43,3 +52,145 @@ class TestReadChangelogForVersion:
         result = read_changelog_for_version("99.99.99")
         # Either "Release 99.99.99" (no CHANGELOG) or actual fallback
         assert "99.99.99" in result
+
+
+class TestIncrementalBuild:
+    """Test content-hash manifest helpers."""
+
+    def test_write_if_changed_skips_identical(self):
+        """Identical content with a matching digest is not rewritten."""
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / "a" / "file.lua"
+            digest, changed = write_if_changed(dest, b"x = 1", None)
+            assert changed and dest.read_bytes() == b"x = 1"
+            digest2, changed2 = write_if_changed(dest, b"x = 1", digest)
+            assert digest2 == digest and not changed2
+
+    def test_write_if_changed_rewrites_new_content(self):
+        """Changed content is written even if a digest is recorded."""
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / "file.lua"
+            digest, _ = write_if_changed(dest, b"x = 1", None)
+            _, changed = write_if_changed(dest, b"x = 2", digest)
+            assert changed and dest.read_bytes() == b"x = 2"
+
+    def test_write_if_changed_restores_missing_file(self):
+        """A deleted output is rewritten even when its digest matches."""
+        with tempfile.TemporaryDirectory() as tmp:
+            dest = Path(tmp) / "file.lua"
+            _, changed = write_if_changed(dest, b"x", content_hash(b"x"))
+            assert changed and dest.exists()
+
+    def test_manifest_roundtrip(self):
+        """Manifest survives save/load; missing manifest loads empty."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / ".manifest-ReaTC-DEV.json"
+            assert load_manifest(path)["files"] == {}
+            save_manifest(path, {"files": {"LICENSE": "ab"}, "inputs": {}, "changed": []})
+            assert load_manifest(path)["files"] == {"LICENSE": "ab"}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A copy of the build inputs, so builds write to a private dist/."""
+    repo = Path(__file__).parent.parent
+    shutil.copytree(repo / "build", tmp_path / "build",
+                    ignore=shutil.ignore_patterns("__pycache__"))
+    for sub in ("Scripts", "Effects"):
+        shutil.copytree(repo / "src" / sub, tmp_path / "src" / sub)
+    for name in ("LICENSE", "README.md", "ABOUT.md", "CHANGELOG.md"):
+        shutil.copy2(repo / name, tmp_path / name)
+    return tmp_path
+
+
+def run_script(tree, script, *args):
+    """Run build.py or verify.py in tree; return (exit status, stdout)."""
+    result = subprocess.run([sys.executable, str(tree / "build" / script), *args],
+                            capture_output=True, text=True, encoding="utf-8")
+    return result.returncode, result.stdout
+
+
+def dist_files(tree):
+    """Map of dist file path → mtime_ns for every build output."""
+    dist = tree / "dist" / "ReaTC-DEV"
+    return {p.relative_to(dist).as_posix(): p.stat().st_mtime_ns
+            for p in dist.rglob("*") if p.is_file()}
+
+
+class TestIncrementalBuildEndToEnd:
+    """Run build.py and verify.py against a copy of the tree."""
+
+    SCRIPT = "Scripts/ReaTC/Timecode/reatc_osc.py"
+
+    def test_rebuild_skips_unchanged_files(self, tree):
+        """A second build writes nothing; editing one source rewrites only it."""
+        assert run_script(tree, "build.py")[0] == 0
+        first = dist_files(tree)
+        assert self.SCRIPT in first
+
+        status, out = run_script(tree, "build.py")
+        assert status == 0
+        assert f"{len(first)} unchanged file(s) skipped" in out
+        assert dist_files(tree) == first
+
+        src = tree / "src" / "Scripts" / "ReaTC" / "reatc_osc.py"
+        src.write_bytes(src.read_bytes() + b"# edited\n")
+        status, out = run_script(tree, "build.py")
+        assert status == 0
+        after = dist_files(tree)
+        assert [rel for rel in after if after[rel] != first[rel]] == [self.SCRIPT]
+
+    def test_stale_outputs_are_removed(self, tree):
+        """An output whose source is gone is deleted on the next build."""
+        extra = tree / "src" / "Scripts" / "ReaTC" / "reatc_extra.lua"
+        extra.write_text("-- @version {{VERSION}}\n", encoding="utf-8")
+        assert run_script(tree, "build.py")[0] == 0
+        assert "Scripts/ReaTC/Timecode/reatc_extra.lua" in dist_files(tree)
+
+        extra.unlink()
+        status, out = run_script(tree, "build.py")
+        assert status == 0 and "reatc_extra.lua (removed)" in out
+        assert "Scripts/ReaTC/Timecode/reatc_extra.lua" not in dist_files(tree)
+
+    def test_clean_rebuilds_everything(self, tree):
+        """--clean wipes dist/ and writes every output again."""
+        assert run_script(tree, "build.py")[0] == 0
+        stray = tree / "dist" / "stray.txt"
+        stray.write_text("x")
+        status, out = run_script(tree, "build.py", "--clean")
+        assert status == 0
+        assert "unchanged file(s) skipped" not in out
+        assert not stray.exists()
+        assert self.SCRIPT in dist_files(tree)
+
+    def test_verify_changed_only_and_full(self, tree):
+        """Default verify re-hashes only what the last build wrote; --full checks all."""
+        assert run_script(tree, "build.py")[0] == 0
+        assert run_script(tree, "build.py")[0] == 0     # nothing changed
+        status, out = run_script(tree, "verify.py")
+        assert status == 0 and "unchanged file(s) present" in out
+        assert run_script(tree, "verify.py", "--full")[0] == 0
+
+        # Tamper with an output the last build did not write
+        out_file = tree / "dist" / "ReaTC-DEV" / self.SCRIPT
+        mtime = out_file.stat().st_mtime_ns
+        out_file.write_bytes(out_file.read_bytes() + b"# tampered\n")
+        os.utime(out_file, ns=(mtime, mtime))
+        assert run_script(tree, "verify.py")[0] == 0
+        status, out = run_script(tree, "verify.py", "--full")
+        assert status == 1 and "content differs from build manifest" in out
+
+    def test_verify_checks_changed_files(self, tree):
+        """A file written by the last build is re-hashed in default mode."""
+        assert run_script(tree, "build.py")[0] == 0
+        out_file = tree / "dist" / "ReaTC-DEV" / self.SCRIPT
+        out_file.write_bytes(out_file.read_bytes() + b"# tampered\n")
+        status, out = run_script(tree, "verify.py")
+        assert status == 1 and "content differs from build manifest" in out
+
+    def test_verify_without_manifest_is_full(self, tree):
+        """No manifest falls back to full verification."""
+        assert run_script(tree, "build.py")[0] == 0
+        (tree / "dist" / ".manifest-ReaTC-DEV.json").unlink()
+        status, out = run_script(tree, "verify.py")
+        assert status == 0 and "falling back to full verification" in out
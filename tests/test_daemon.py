@@ -0,0 +1,488 @@
+"""Tests for shared daemon helpers (reatc_daemon.py) and the --status back-channel."""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import SRC_SCRIPTS
+from reatc_daemon import (
+    IPI_BINS, IPI_MAX_US, MAX_PRODUCERS, STATUS_INTERVAL, WARMUP_PACKETS, Arbiter, DaemonStats,
+    JitterMeter, StatusWriter, add_daemon_args, configure_socket, format_status, ipi_bin,
+    ipi_bin_upper_us, parse_bind, parse_cpus, parse_dscp, parse_listen,
+)
+
+
+def parse_status(text):
+    """Parse a status file body into a dict of strings."""
+    return dict(line.split("=", 1) for line in text.splitlines())
+
+
+class TestDaemonStats:
+    """Test counter bookkeeping."""
+
+    def test_send_failed(self):
+        """Send failures are counted and the last error is kept."""
+        stats = DaemonStats()
+        stats.send_failed(OSError(55, "No buffer space available"))
+        assert stats.send_errors == 1
+        assert "No buffer space" in stats.last_error
+
+    def test_parse_failed(self):
+        """Parse failures are counted separately from send failures."""
+        stats = DaemonStats()
+        stats.parse_failed("bad line")
+        assert stats.parse_errors == 1 and stats.send_errors == 0
+
+
+class TestStatusFile:
+    """Test status file format and writer."""
+
+    def test_format_fields(self):
+        """Status body carries heartbeat, counters and last error."""
+        stats = DaemonStats()
+        stats.packets_sent = 7
+        stats.parse_failed("line\nwith newline")
+        fields = parse_status(format_status(stats, 3, 12))
+        assert fields["seq"] == "3"
+        assert fields["packets_sent"] == "7"
+        assert fields["parse_errors"] == "1"
+        assert fields["queue_depth"] == "12"
+        assert "\n" not in fields["last_error"]
+        assert float(fields["heartbeat"]) > 0
+        assert 0 <= float(fields["progress_age"]) < 60
+        assert float(fields["cpu_s"]) > 0
+
+    def test_progress_age_tracks_send_loop(self):
+        """progress_age grows while the send loop takes no lines, heartbeat or not."""
+        stats = DaemonStats()
+        stats.last_read_ns = time.perf_counter_ns() - 5_000_000_000
+        assert float(parse_status(format_status(stats, 1, 100))["progress_age"]) >= 5.0
+        stats.last_read_ns = time.perf_counter_ns()
+        assert float(parse_status(format_status(stats, 2, 0))["progress_age"]) < 1.0
+
+    def test_writer_replaces_file(self):
+        """StatusWriter leaves a complete file and no temp file behind."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "artnet.status"
+            stats = DaemonStats()
+            writer = StatusWriter(str(path), stats, interval=0.01)
+            writer.start()
+            stats.packets_sent = 5
+            writer.stop()
+            fields = parse_status(path.read_text())
+            assert fields["packets_sent"] == "5"
+            assert not (Path(tmp) / "artnet.status.tmp").exists()
+
+
+class TestStatusWriterErrors:
+    """Test that the status thread survives unexpected errors."""
+
+    def test_writer_survives_format_error(self):
+        """An exception while formatting is recorded and the next write works."""
+        class Broken:
+            def status(self):
+                raise RuntimeError("boom")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "osc.status"
+            stats = DaemonStats()
+            writer = StatusWriter(str(path), stats)
+            stats.arbiter = Broken()
+            writer.write()
+            assert "boom" in stats.last_error
+            stats.arbiter = None
+            writer.write()
+            assert parse_status(path.read_text())["last_error"].startswith("status:")
+
+
+class TestSocketOptions:
+    """Test socket option parsing, application and read-back."""
+
+    def test_parse_dscp(self):
+        """DSCP accepts class names and code points."""
+        assert parse_dscp("ef") == 46
+        assert parse_dscp("AF41") == 34
+        assert parse_dscp("CS5") == 40
+        assert parse_dscp("0x2e") == 46
+        for bad in ("XX", "64", "-1"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_dscp(bad)
+
+    def test_parse_bind(self):
+        """Bind takes IP or IP:PORT."""
+        assert parse_bind("127.0.0.1") == ("127.0.0.1", 0)
+        assert parse_bind("10.0.0.5:6454") == ("10.0.0.5", 6454)
+        for bad in ("localhost", "10.0.0.5:99999", "10.0.0.5:x"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_bind(bad)
+
+    def test_options_read_back(self):
+        """Applied options are verified and reported from the socket."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            applied, problems = configure_socket(
+                sock, dscp=46, sndbuf=65536, ttl=4, multicast_if="127.0.0.1",
+                bind=("127.0.0.1", 0))
+            assert problems == []
+            assert applied["dscp"] == "46"
+            assert int(applied["sndbuf"]) >= 65536
+            assert applied["ttl"] == "4"
+            assert applied["multicast_if"] == "127.0.0.1"
+            assert applied["bind"] == "127.0.0.1:{}".format(sock.getsockname()[1])
+
+    def test_refused_option_is_reported(self):
+        """A bind the OS refuses is reported, not raised."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            applied, problems = configure_socket(sock, bind=("192.0.2.1", 0))
+            assert applied["bind"] == "failed"
+            assert len(problems) == 1 and problems[0].startswith("bind")
+
+
+class TestRealtime:
+    """Test jitter measurement and low-jitter mode helpers."""
+
+    def test_jitter_meter(self):
+        """Intervals and latency are summarised in microseconds."""
+        meter = JitterMeter()
+        t = 0
+        for ipi_us in [40_000] * 98 + [39_000, 41_000]:
+            t += ipi_us * 1000
+            meter.tick(t - 20_000, t)
+        summary = meter.summary()
+        assert meter.count == 99
+        assert summary["ipi_mean_us"] == 40_000
+        assert 100 <= summary["ipi_jitter_us"] <= 200
+        assert summary["ipi_max_us"] == 41_000
+        assert 40_000 <= summary["ipi_p99_us"] <= 41_000 * 65 // 64
+        assert summary["lat_mean_us"] == 20 and summary["lat_max_us"] == 20
+
+    def test_histogram_bins(self):
+        """Bins are contiguous, hold their interval and stay within 1/64 of it."""
+        assert IPI_BINS < 1100
+        upper = 0
+        for us in range(0, IPI_MAX_US, 997):
+            i = ipi_bin(us)
+            assert i < IPI_BINS - 1 and ipi_bin_upper_us(i) > us
+            assert ipi_bin_upper_us(i) <= max(us + 1, us * 65 // 64 + 1)
+            assert ipi_bin_upper_us(i) >= upper
+            upper = ipi_bin_upper_us(i)
+        for i in range(1, IPI_BINS - 1):
+            assert ipi_bin(ipi_bin_upper_us(i - 1)) == i
+
+    def test_percentiles(self):
+        """Percentiles match a sorted list of the intervals to within a bin."""
+        meter = JitterMeter()
+        intervals = [33_000 + (i * 7919) % 2_000 for i in range(1000)] + [5_000_000]
+        t = 0
+        for ipi_us in intervals:
+            t += ipi_us * 1000
+            meter.tick(t, t)
+        ordered = sorted(intervals[1:])
+        for fraction in (0.5, 0.9, 0.99):
+            exact = ordered[int(fraction * len(ordered)) - 1]
+            assert exact < meter.percentile_us(fraction) <= exact * 65 // 64 + 1
+        assert meter.percentile_us(1.0) == ipi_bin_upper_us(IPI_BINS - 1)
+        assert JitterMeter().percentile_us(0.99) == 0
+
+    def test_parse_cpus(self):
+        """CPU lists are comma-separated non-negative integers."""
+        assert parse_cpus("2") == {2}
+        assert parse_cpus("0,3") == {0, 3}
+        for bad in ("", "a", "-1"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_cpus(bad)
+
+    def test_enable_realtime_in_child(self):
+        """Scheduling falls back gracefully and always reports what it got."""
+        code = ("from reatc_daemon import enable_realtime; "
+                "report, problems = enable_realtime(); print(report['sched'])")
+        proc = subprocess.run([sys.executable, "-c", code], cwd=SRC_SCRIPTS,
+                              capture_output=True, text=True, timeout=10)
+        assert proc.returncode == 0
+        assert proc.stdout.strip().split(":")[0] in ("fifo", "nice", "default")
+
+
+class TestDaemonArgs:
+    """Test the option set both daemons share."""
+
+    def test_defaults(self):
+        """With no options every feature is off and status uses the default rate."""
+        parser = argparse.ArgumentParser()
+        add_daemon_args(parser)
+        args = parser.parse_args([])
+        assert args.status is None and args.status_interval == STATUS_INTERVAL
+        assert args.profile is None and args.profile_dir is None
+        assert args.listen is None and not args.realtime and args.dscp is None
+
+    def test_all_groups(self):
+        """Status, profiling, socket, realtime and listen options parse together."""
+        parser = argparse.ArgumentParser()
+        add_daemon_args(parser)
+        args = parser.parse_args(["--status", "s", "--status-interval", "0.1", "--profile", "cpu",
+                                  "--dscp", "EF", "--realtime", "--listen", "9000"])
+        assert (args.status, args.status_interval, args.profile) == ("s", 0.1, "cpu")
+        assert args.dscp == 46 and args.realtime and args.listen[0] == socket.AF_INET
+
+
+class TestDaemonStatus:
+    """Run the daemons end-to-end with --status."""
+
+    def _run(self, args, stdin):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "daemon.status"
+            proc = subprocess.run(
+                [sys.executable, *args, "--status", str(path)],
+                input=stdin, capture_output=True, text=True, timeout=10,
+            )
+            assert proc.returncode == 0
+            return parse_status(path.read_text())
+
+    def test_osc_counts_packets_and_parse_errors(self):
+        """OSC daemon reports sent packets and rejected lines."""
+        fields = self._run(
+            [str(SRC_SCRIPTS / "reatc_osc.py"), "127.0.0.1", "9", "/tc"],
+            "1 2 3 4 1\n1 2 3 4 1\nbad\n1 2 3 99 1\n",
+        )
+        assert fields["packets_sent"] == "2"
+        assert fields["parse_errors"] == "2"
+
+    def test_socket_options_in_status(self):
+        """Socket options given on the command line appear as sock_* lines."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as rx:
+            rx.bind(("127.0.0.1", 0))
+            rx.settimeout(5)
+            fields = self._run(
+                [str(SRC_SCRIPTS / "reatc_osc.py"), "127.0.0.1", str(rx.getsockname()[1]), "/tc",
+                 "--dscp", "EF", "--bind", "127.0.0.1"],
+                "1 2 3 4 1\n",
+            )
+            _, (src_ip, _) = rx.recvfrom(256)
+        assert fields["sock_dscp"] == "46"
+        assert fields["sock_bind"].startswith("127.0.0.1:")
+        assert src_ip == "127.0.0.1"
+
+    def test_realtime_mode_in_status(self):
+        """--realtime reports its scheduling, freezes GC after warm-up and measures jitter."""
+        lines = "".join(f"1 2 3 {i % 25} 1\n" for i in range(WARMUP_PACKETS + 10))
+        fields = self._run(
+            [str(SRC_SCRIPTS / "reatc_osc.py"), "127.0.0.1", "9", "/tc", "--realtime"],
+            lines,
+        )
+        assert fields["packets_sent"] == str(WARMUP_PACKETS + 10)
+        assert fields["rt_sched"].split(":")[0] in ("fifo", "nice", "default")
+        assert fields["rt_gc"].startswith(("frozen", "disabled"))
+        assert int(fields["ipi_max_us"]) >= int(fields["ipi_mean_us"]) >= 0
+
+    def test_artnet_survives_send_errors(self):
+        """Art-Net daemon stays alive and reports a failing destination."""
+        fields = self._run(
+            [str(SRC_SCRIPTS / "reatc_artnet.py"), "host.invalid"],
+            "1 2 3 4 1\n1 2 3 5 1\n",
+        )
+        assert fields["packets_sent"] == "0"
+        assert fields["send_errors"] == "2"
+
+
+class TestArbiter:
+    """Test producer arbitration and failover in listen mode."""
+
+    def test_highest_priority_wins(self):
+        """A higher-priority producer takes over at once; lower ones are shadowed."""
+        arb = Arbiter(timeout=0.5)
+        assert arb.offer("backup", 0, 0.00)
+        assert arb.offer("main", 10, 0.01)
+        assert not arb.offer("backup", 0, 0.02)
+        assert arb.offer("main", 10, 0.03)
+        assert arb.switches == 1 and arb.shadowed == 1
+
+    def test_tie_keeps_producer_on_air(self):
+        """Equal priorities do not flap between producers."""
+        arb = Arbiter(timeout=0.5)
+        assert arb.offer("a", 5, 0.0)
+        assert not arb.offer("b", 5, 0.1)
+        assert arb.offer("a", 5, 0.2)
+
+    def test_failover_when_quiet(self):
+        """The next producer takes over once the one on air is quiet for the timeout."""
+        arb = Arbiter(timeout=0.5)
+        assert arb.offer("main", 10, 0.0)
+        assert not arb.offer("backup", 0, 0.4)
+        assert arb.offer("backup", 0, 0.6)
+        assert arb.status(0.6)["active"] == "backup"
+        assert arb.offer("main", 10, 0.7)          # main returns and preempts
+        assert arb.switches == 2
+
+    def test_priority_override(self):
+        """Daemon-side overrides replace the declared priority."""
+        arb = Arbiter({"backup": 20}, timeout=0.5)
+        assert arb.offer("main", 10, 0.0)
+        assert arb.offer("backup", 0, 0.1)
+        assert arb.status(0.1)["producers"] == "backup:20,main:10"
+
+    def test_status_while_producers_change(self):
+        """status() from the status thread is safe while offer() adds and prunes."""
+        arb = Arbiter(timeout=0.001)
+        errors = []
+        done = threading.Event()
+
+        def poll():
+            while not done.is_set():
+                try:
+                    arb.status()
+                except RuntimeError as e:   # "dictionary changed size during iteration"
+                    errors.append(e)
+                    return
+
+        poller = threading.Thread(target=poll)
+        poller.start()
+        try:
+            for i in range(50_000):
+                arb.offer(f"p{i}", i % 5, time.monotonic())
+        finally:
+            done.set()
+            poller.join()
+        assert errors == []
+
+    def test_producer_table_is_bounded(self):
+        """Stale anonymous producers are pruned."""
+        arb = Arbiter(timeout=0.5)
+        for i in range(MAX_PRODUCERS * 3):
+            arb.offer(f"127.0.0.1:{40000 + i}", 0, float(i))
+        assert len(arb.producers) <= MAX_PRODUCERS
+
+    def test_producer_table_is_bounded_while_live(self):
+        """New names beyond MAX_PRODUCERS live producers are dropped and counted."""
+        arb = Arbiter(timeout=0.5)
+        for i in range(MAX_PRODUCERS + 36):
+            arb.offer(f"p{i}", 0, 1.0 + i * 0.001)
+        assert len(arb.producers) == MAX_PRODUCERS
+        assert arb.status(1.1)["rejected"] == "36"
+        assert arb.offer("p1", 0, 1.2) is False            # known producer, shadowed
+        assert arb.offer("late", 0, 2.0)                    # the others went quiet
+        assert "late" in arb.producers and len(arb.producers) <= MAX_PRODUCERS
+
+    def test_parse_listen(self):
+        """Listen addresses: UDP with optional host, or a Unix path."""
+        assert parse_listen("udp:0.0.0.0:9988") == (socket.AF_INET, ("0.0.0.0", 9988))
+        assert parse_listen(":9988") == (socket.AF_INET, ("127.0.0.1", 9988))
+        if hasattr(socket, "AF_UNIX"):
+            assert parse_listen("unix:/tmp/x.sock") == (socket.AF_UNIX, "/tmp/x.sock")
+        for bad in ("udp:host:1", "udp:127.0.0.1:0", "unix:"):
+            with pytest.raises(argparse.ArgumentTypeError):
+                parse_listen(bad)
+
+
+class TestListenMode:
+    """Run a daemon in listen mode with several producers."""
+
+    def _start(self, listen, rx_port, status_path, *extra):
+        return subprocess.Popen(
+            [sys.executable, str(SRC_SCRIPTS / "reatc_osc.py"), "127.0.0.1", str(rx_port), "/tc",
+             "--listen", listen, "--failover", "0.3", "--status", str(status_path), *extra],
+            stdin=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        )
+
+    def _wait_for(self, path):
+        deadline = time.monotonic() + 5
+        while not os.path.exists(path):
+            assert time.monotonic() < deadline, f"{path} never appeared"
+            time.sleep(0.02)
+
+    def _recv_hours(self, rx):
+        """Return the hours argument of every OSC message waiting on rx."""
+        hours = []
+        rx.settimeout(0.2)
+        try:
+            while True:
+                data = rx.recv(256)
+                hours.append(int.from_bytes(data[-20:-16], "big", signed=True))
+        except socket.timeout:
+            return hours
+
+    def test_udp_priority_and_failover(self):
+        """Main wins over backup; backup takes over when main goes quiet."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as rx, \
+                socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx, \
+                tempfile.TemporaryDirectory() as tmp:
+            rx.bind(("127.0.0.1", 0))
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+                probe.bind(("127.0.0.1", 0))
+                port = probe.getsockname()[1]
+            status_path = Path(tmp) / "osc.status"
+            proc = self._start(f"udp:127.0.0.1:{port}", rx.getsockname()[1], status_path)
+            try:
+                self._wait_for(status_path)
+                dest = ("127.0.0.1", port)
+                for f in range(5):
+                    tx.sendto(f"1 0 0 {f} 1 main 10\n".encode(), dest)
+                    tx.sendto(f"2 0 0 {f} 1 backup 0\n".encode(), dest)
+                    time.sleep(0.01)
+                assert set(self._recv_hours(rx)) == {1}
+                time.sleep(0.4)                       # main goes quiet
+                tx.sendto(b"2 0 0 9 1 backup 0\n", dest)
+                assert self._recv_hours(rx) == [2]
+            finally:
+                proc.send_signal(signal.SIGTERM)
+                assert proc.wait(timeout=5) == 0
+            fields = parse_status(status_path.read_text())
+            assert fields["listen_switches"] == "1"
+            assert fields["listen_shadowed"] == "5"
+            assert fields["packets_sent"] == "6"
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+    def test_unix_socket_and_cleanup(self):
+        """Unix datagram producers work and the socket path is removed on exit."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as rx, \
+                tempfile.TemporaryDirectory() as tmp:
+            rx.bind(("127.0.0.1", 0))
+            sock_path = os.path.join(tmp, "reatc.sock")
+            status_path = Path(tmp) / "osc.status"
+            proc = self._start(f"unix:{sock_path}", rx.getsockname()[1], status_path)
+            try:
+                self._wait_for(status_path)
+                with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as tx:
+                    # Unbound senders have no address, so a name is required
+                    tx.sendto(b"3 0 0 0 1 a\n3 0 0 1 1 a\n3 0 0 2 1\nbad\n", sock_path)
+                assert self._recv_hours(rx) == [3, 3]
+            finally:
+                proc.send_signal(signal.SIGTERM)
+                assert proc.wait(timeout=5) == 0
+            assert not os.path.exists(sock_path)
+            fields = parse_status(status_path.read_text())
+            assert fields["parse_errors"] == "2"
+            assert fields["listen_producers"] in ("", "a:0")
+
+    def test_malformed_records_do_not_hold_output(self):
+        """A high-priority producer sending bad records does not mute a healthy standby."""
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as rx, \
+                socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as tx, \
+                tempfile.TemporaryDirectory() as tmp:
+            rx.bind(("127.0.0.1", 0))
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as probe:
+                probe.bind(("127.0.0.1", 0))
+                port = probe.getsockname()[1]
+            status_path = Path(tmp) / "osc.status"
+            proc = self._start(f"udp:127.0.0.1:{port}", rx.getsockname()[1], status_path)
+            try:
+                self._wait_for(status_path)
+                dest = ("127.0.0.1", port)
+                for f in range(5):
+                    tx.sendto(b"99 0 0 0 1 main 10\n", dest)
+                    tx.sendto(b"1 x 0 0 1 main 10\n", dest)
+                    tx.sendto(f"2 0 0 {f} 1 backup 0\n".encode(), dest)
+                    time.sleep(0.01)
+                assert self._recv_hours(rx) == [2] * 5
+            finally:
+                proc.send_signal(signal.SIGTERM)
+                assert proc.wait(timeout=5) == 0
+            fields = parse_status(status_path.read_text())
+            assert fields["parse_errors"] == "10"
+            assert fields["listen_shadowed"] == "0"
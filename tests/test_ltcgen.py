@@ -1,6 +1,23 @@
 """Tests for LTC frame building, TC advance, and drop-frame logic (reatc_ltcgen.py)."""
 
-from reatc_ltcgen import build_ltc_frame, advance_tc, render_frame, AMPLITUDE, SYNC_WORD
+import struct
+import subprocess
+import sys
+import tempfile
+import wave
+from itertools import islice
+from pathlib import Path
+
+import pytest
+
+from conftest import SRC_SCRIPTS
+from reatc_ltcgen import (
+    build_ltc_frame, advance_tc, render_frame, frame_sample_counts,
+    frame_start_sample, half_bit_edges, boundary_error_report, DeltaRenderer,
+    parse_segments, generate_ltc_segments_wav, generate_ltc_wav, edge_kernel,
+    RISE_TIME,
+    AMPLITUDE, SYNC_WORD,
+)
 
 
 class TestBuildLtcFrame:
@@ -200,3 +217,225 @@ class TestRenderFrame:
         for n_samples in [960, 1920, 2000]:
             data, _ = render_frame(bits, n_samples, 1, AMPLITUDE)
             assert len(data) == n_samples * 2
+
+
+class TestExactScheduling:
+    """Test exact rational frame and bit boundaries."""
+
+    def test_df_lands_on_exact_sample(self):
+        """30000 frames of 29.97DF at 48 kHz is exactly 1001 seconds."""
+        total = sum(islice(frame_sample_counts(2, 48000), 30000))
+        assert total == 48000 * 1001
+
+    def test_accumulator_matches_closed_form(self):
+        """Incremental frame counts agree with frame_start_sample()."""
+        for fps_type in range(4):
+            for rate in (44100, 48000):
+                pos = 0
+                counts = frame_sample_counts(fps_type, rate)
+                for k in range(1, 3000):
+                    pos += next(counts)
+                    assert pos == frame_start_sample(k, fps_type, rate)
+
+    def test_integer_rates_are_constant(self):
+        """25fps at 48 kHz is exactly 1920 samples every frame."""
+        assert set(islice(frame_sample_counts(1, 48000), 500)) == {1920}
+
+    def test_half_bit_edges(self):
+        """Half-bit edges span the frame and are non-decreasing."""
+        for n in (1470, 1471, 1601, 1602, 1920):
+            edges = half_bit_edges(n)
+            assert len(edges) == 161
+            assert edges[0] == 0 and edges[-1] == n
+            assert all(a <= b for a, b in zip(edges, edges[1:]))
+
+    def test_boundary_report(self):
+        """Exact scheduler error stays within half a sample; float drifts on DF."""
+        rows = boundary_error_report()
+        assert len(rows) == 4 * 6
+        assert all(r["max_error"] <= 0.5 for r in rows)
+        df_48k = next(r for r in rows if r["fps_type"] == 2 and r["sample_rate"] == 48000)
+        assert df_48k["float_drift"] != 0
+
+
+class TestDeltaRenderer:
+    """Test delta-patched rendering against the reference renderer."""
+
+    def test_matches_reference_across_rollovers(self):
+        """Delta output is byte-identical through second/minute/DF rollovers."""
+        for fps_type in range(4):
+            for rate in (44100, 48000):
+                renderer = DeltaRenderer(AMPLITUDE)
+                ref_out = delta_out = 1
+                h, m, s, f = 0, 9, 58, 0
+                counts = frame_sample_counts(fps_type, rate)
+                for _ in range(200):
+                    n = next(counts)
+                    bits = build_ltc_frame(h, m, s, f, fps_type)
+                    ref, ref_out = render_frame(bits, n, ref_out, AMPLITUDE)
+                    got, delta_out = renderer.render(bits, n, delta_out)
+                    assert bytes(got) == ref
+                    assert delta_out == ref_out
+                    h, m, s, f = advance_tc(h, m, s, f, fps_type)
+
+    def test_odd_parity_and_polarity_change(self):
+        """Arbitrary bit patterns (odd parity) still match the reference."""
+        pattern = [(i * 7 + 3) % 5 % 2 for i in range(80)]
+        renderer = DeltaRenderer(AMPLITUDE)
+        ref_out = delta_out = 1
+        for k in range(40):
+            bits = pattern[k:] + pattern[:k]
+            ref, ref_out = render_frame(bits, 1920, ref_out, AMPLITUDE)
+            got, delta_out = renderer.render(bits, 1920, delta_out)
+            assert bytes(got) == ref
+            assert delta_out == ref_out
+
+
+class TestSegments:
+    """Test continuous multi-region rendering."""
+
+    SEGMENTS = ["10.0 1 0 0 0 1 2.0", "# comment", "", "13.0 2 0 0 0 3 1.0"]
+
+    def _render(self, gap_fill):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "ltc.wav")
+            total = generate_ltc_segments_wav(parse_segments(self.SEGMENTS), 48000,
+                                              path, gap_fill=gap_fill)
+            with wave.open(path) as wav:
+                data = wav.readframes(wav.getnframes())
+        return total, struct.unpack(f"<{len(data) // 2}h", data)
+
+    def test_parse_segments_sorted(self):
+        """Comments are skipped and segments are sorted by position."""
+        segs = parse_segments(["5 0 0 0 0 1 1", "1 0 0 0 0 1 1"])
+        assert [seg[0] for seg in segs] == [1.0, 5.0]
+
+    def test_parse_segments_rejects_bad_lines(self):
+        """Malformed or out-of-range segments raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_segments(["1 0 0 0 0 1"])
+        with pytest.raises(ValueError):
+            parse_segments(["1 0 0 0 0 7 1"])
+
+    @pytest.mark.parametrize("line", [
+        "0 25 0 0 0 1 1.0",      # hour
+        "0 0 70 0 0 1 1.0",      # minute
+        "0 0 0 60 0 1 1.0",      # second
+        "0 0 0 0 25 1 1.0",      # frame at 25 fps
+        "0 0 0 0 24 0 1.0",      # frame at 24 fps
+        "0 0 1 0 0 2 1.0",       # dropped label 00:01:00;00
+        "0 0 1 0 1 2 1.0",       # dropped label 00:01:00;01
+    ])
+    def test_parse_segments_rejects_invalid_tc(self, line):
+        """Start TCs that do not exist at the segment's rate raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_segments([line])
+
+    def test_parse_segments_accepts_df_edges(self):
+        """Frame 2 after a dropped minute and frames 0/1 at a 10th minute are valid."""
+        assert len(parse_segments(["0 0 1 0 2 2 1.0", "1 0 10 0 0 2 1.0"])) == 2
+
+    def test_segments_cli_rejects_invalid_tc(self, tmp_path):
+        """The CLI reports a bad segment and exits 1 without writing a WAV."""
+        seg_file = tmp_path / "segments.txt"
+        seg_file.write_text("0 25 70 99 45 2 1.0\n")
+        out = tmp_path / "ltc.wav"
+        result = subprocess.run(
+            [sys.executable, str(SRC_SCRIPTS / "reatc_ltcgen.py"), "--segments",
+             str(seg_file), "48000", str(out)],
+            capture_output=True, text=True)
+        assert result.returncode == 1
+        assert "out of range" in result.stderr and "Traceback" not in result.stderr
+        assert not out.exists()
+
+    def test_segments_usage_lists_flags(self):
+        """The --segments usage message documents --shaped and --index."""
+        result = subprocess.run(
+            [sys.executable, str(SRC_SCRIPTS / "reatc_ltcgen.py"), "--segments"],
+            capture_output=True, text=True)
+        assert result.returncode == 1
+        assert "--shaped" in result.stderr and "--index" in result.stderr
+
+    def test_silence_gap(self):
+        """Gap between regions is digital silence; file spans first to last."""
+        total, samples = self._render("silence")
+        assert total == len(samples) == 4 * 48000
+        assert set(samples[2 * 48000:3 * 48000]) == {0}
+        assert 0 not in samples[:2 * 48000]
+
+    def test_freerun_gap(self):
+        """Free-run fills the gap with code instead of silence."""
+        total, samples = self._render("freerun")
+        assert total == 4 * 48000
+        assert 0 not in samples
+
+    def test_segment_matches_single_render(self):
+        """A segment's first frames match generate_ltc_wav's output."""
+        _, samples = self._render("silence")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "one.wav")
+            generate_ltc_wav(1, 1, 0, 0, 0, 50, 48000, path)
+            with wave.open(path) as wav:
+                ref = wav.readframes(wav.getnframes())
+        assert struct.pack(f"<{len(ref) // 2}h", *samples[:len(ref) // 2]) == ref
+
+    def test_unknown_gap_fill(self):
+        """Unknown gap fill mode raises ValueError."""
+        with pytest.raises(ValueError):
+            generate_ltc_segments_wav(parse_segments(self.SEGMENTS), 48000,
+                                      "unused.wav", gap_fill="noise")
+
+
+class TestEdgeShaping:
+    """Test SMPTE rise-time edge kernels."""
+
+    def test_kernel_is_antisymmetric(self):
+        """Falling shape is the exact negation of the rising shape."""
+        rise, fall = edge_kernel(48000, AMPLITUDE)
+        n = len(rise) // 2
+        up = struct.unpack(f"<{n}h", rise)
+        down = struct.unpack(f"<{n}h", fall)
+        assert up == tuple(-v for v in down)
+        assert all(-AMPLITUDE < v < AMPLITUDE for v in up)
+        assert list(up) == sorted(up)
+
+    def test_rise_time_within_spec(self):
+        """10-90 % rise time of the sampled shape is 25 +/- 5 us at 192 kHz."""
+        rate = 192000
+        rise, _ = edge_kernel(rate, AMPLITUDE)
+        up = struct.unpack(f"<{len(rise) // 2}h", rise)
+        lo, hi = -0.8 * AMPLITUDE, 0.8 * AMPLITUDE
+        # Linear interpolation of the 10 % and 90 % crossings
+        def crossing(level):
+            pts = [(-0.5, -AMPLITUDE)] + [(j, v) for j, v in enumerate(up)] + [(len(up), AMPLITUDE)]
+            for (t0, v0), (t1, v1) in zip(pts, pts[1:]):
+                if v0 <= level <= v1:
+                    return t0 + (level - v0) / (v1 - v0) * (t1 - t0)
+        rise_time = (crossing(hi) - crossing(lo)) / rate
+        assert abs(rise_time - RISE_TIME) <= 5e-6
+
+    def test_shaped_frame_length_and_polarity(self):
+        """Shaped frames have the same length and final polarity as square."""
+        bits = build_ltc_frame(1, 2, 3, 4, 1)
+        kernel = edge_kernel(48000, AMPLITUDE)
+        square, out_sq = render_frame(bits, 1920, 1, AMPLITUDE)
+        shaped, out_sh = render_frame(bits, 1920, 1, AMPLITUDE, kernel)
+        assert len(shaped) == len(square)
+        assert out_sh == out_sq
+        assert shaped != square
+
+    def test_delta_renderer_shaped_matches_reference(self):
+        """Delta patching with a kernel is byte-identical to render_frame."""
+        for rate in (44100, 48000, 192000):
+            kernel = edge_kernel(rate, AMPLITUDE)
+            renderer = DeltaRenderer(AMPLITUDE, kernel)
+            ref_out = delta_out = 1
+            h, m, s, f = 0, 9, 59, 20
+            counts = frame_sample_counts(2, rate)
+            for _ in range(120):
+                n = next(counts)
+                bits = build_ltc_frame(h, m, s, f, 2)
+                ref, ref_out = render_frame(bits, n, ref_out, AMPLITUDE, kernel)
+                got, delta_out = renderer.render(bits, n, delta_out)
+                assert bytes(got) == ref
+                h, m, s, f = advance_tc(h, m, s, f, 2)
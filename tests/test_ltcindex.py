@@ -0,0 +1,187 @@
+"""Tests for the TC → sample sidecar index and LTC decoder (reatc_ltcindex.py)."""
+
+import array
+import random
+import wave
+
+import pytest
+
+from reatc_ltcgen import (
+    advance_tc, frame_start_sample, generate_ltc_wav, generate_ltc_segments_wav,
+    parse_segments, FRAMES_PER_DAY,
+)
+from reatc_ltcindex import (
+    IndexBuilder, LtcIndex, build_index_for_wav, decode_ltc_frames,
+    frame_number_tc, frames_started, index_path_for, parse_tc, tc_frame_number,
+)
+
+
+def _tcs(start, fps_type, n):
+    """Return n consecutive timecodes from start."""
+    out, tc = [], start
+    for _ in range(n):
+        out.append(tc)
+        tc = advance_tc(*tc, fps_type)
+    return out
+
+
+class TestFrameNumbers:
+    """Test timecode ↔ frame-number conversion."""
+
+    @pytest.mark.parametrize("fps_type", [0, 1, 2, 3])
+    def test_round_trip_full_day(self, fps_type):
+        """frame_number_tc inverts tc_frame_number for every frame of a day."""
+        tc = (0, 0, 0, 0)
+        for n in range(0, FRAMES_PER_DAY[fps_type], 7):
+            tc = frame_number_tc(n, fps_type)
+            assert tc_frame_number(*tc, fps_type) == n
+        assert advance_tc(*frame_number_tc(FRAMES_PER_DAY[fps_type] - 1, fps_type),
+                          fps_type) == (0, 0, 0, 0)
+
+    def test_drop_frame_skips_labels(self):
+        """00:01:00;02 directly follows 00:00:59;29 at 29.97DF."""
+        assert tc_frame_number(0, 1, 0, 2, 2) == tc_frame_number(0, 0, 59, 29, 2) + 1
+        assert tc_frame_number(0, 10, 0, 0, 2) == 17982
+
+    def test_frames_started(self):
+        """Counts frames whose first sample lies before n_samples."""
+        for n in (1, 1601, 1602, 1603, 48048):
+            expected = sum(1 for k in range(100) if frame_start_sample(k, 2, 48000) < n)
+            assert frames_started(n, 2, 48000) == expected
+
+    def test_parse_tc(self):
+        """Accepts ':' or ';' separators and rejects malformed input."""
+        assert parse_tc("01:23:45;10") == (1, 23, 45, 10)
+        with pytest.raises(ValueError):
+            parse_tc("01:23:45")
+
+
+class TestIndex:
+    """Test writing, mapping and querying index files."""
+
+    @pytest.mark.parametrize("fps_type", [0, 1, 2, 3])
+    @pytest.mark.parametrize("sample_rate", [44100, 48000])
+    def test_baked_index_is_exact(self, tmp_path, fps_type, sample_rate):
+        """Every frame of a baked file maps to frame_start_sample()."""
+        start = (23, 59, 50, 2)
+        wav_path = str(tmp_path / "ltc.wav")
+        generate_ltc_wav(fps_type, *start, 600, sample_rate, wav_path,
+                         index_path=index_path_for(wav_path))
+        with LtcIndex(index_path_for(wav_path)) as index:
+            assert len(index) == 2                  # split at midnight
+            for k, tc in enumerate(_tcs(start, fps_type, 600)):
+                assert index.lookup(*tc) == frame_start_sample(k, fps_type, sample_rate)
+            assert index.lookup(23, 59, 49, 0) is None
+            assert index.lookup(0, 0, 30, 0) is None
+
+    def test_segments_index(self, tmp_path):
+        """A segment render indexes each segment at its place in the file."""
+        segments = parse_segments([
+            "10.0 1 0 0 0 1 2.0",
+            "14.0 2 0 0 0 2 1.0",
+        ])
+        wav_path = str(tmp_path / "seg.wav")
+        generate_ltc_segments_wav(segments, 48000, wav_path,
+                                  index_path=index_path_for(wav_path))
+        with LtcIndex(index_path_for(wav_path)) as index:
+            assert index.lookup(1, 0, 0, 0) == 0
+            assert index.lookup(1, 0, 1, 5) == frame_start_sample(30, 1, 48000)
+            assert index.lookup(2, 0, 0, 3) == 4 * 48000 + frame_start_sample(3, 2, 48000)
+            assert index.lookup(1, 0, 2, 0) is None   # in the silent gap
+
+    def test_overlapping_runs(self, tmp_path):
+        """A TC present twice is found in both runs, latest start first."""
+        builder = IndexBuilder(48000)
+        builder.add_generated(1, 0, 0, 0, 1, 25 * 60)             # 01:00:00 - 01:00:59
+        builder.add_generated(1, 0, 30, 0, 1, 25, 10_000_000)     # 01:00:30 again
+        builder.add_generated(0, 0, 0, 0, 1, 25, 20_000_000)
+        path = str(tmp_path / "x.ltcidx")
+        builder.write(path)
+        with LtcIndex(path) as index:
+            assert index.lookup_all(1, 0, 30, 0) == [10_000_000, 30 * 48000]
+            assert index.lookup(1, 0, 40, 0) == 40 * 48000
+
+    def test_rejects_foreign_file(self, tmp_path):
+        """Opening a non-index file raises ValueError."""
+        path = tmp_path / "bad.ltcidx"
+        path.write_bytes(b"RIFF" + bytes(64))
+        with pytest.raises(ValueError):
+            LtcIndex(str(path))
+
+
+class TestDecoder:
+    """Test building an index from recorded LTC."""
+
+    def test_decodes_baked_frames_exactly(self, tmp_path):
+        """Decoding a square-edge render recovers every TC and frame start."""
+        wav_path = str(tmp_path / "ltc.wav")
+        generate_ltc_wav(2, 0, 9, 59, 20, 300, 48000, wav_path)
+        frames = list(decode_ltc_frames(wav_path))
+        expected = _tcs((0, 9, 59, 20), 2, 300)
+        assert [fr[1:5] for fr in frames] == expected
+        assert all(fr[5] == 2 for fr in frames)
+        assert [fr[0] for fr in frames] == [frame_start_sample(k, 2, 48000) for k in range(300)]
+
+    @pytest.mark.parametrize("fps_type", [0, 1, 3])
+    def test_infers_non_drop_rate(self, tmp_path, fps_type):
+        """24/25/30 are told apart by bit rate."""
+        wav_path = str(tmp_path / "ltc.wav")
+        generate_ltc_wav(fps_type, 1, 0, 0, 0, 50, 48000, wav_path)
+        assert {fr[5] for fr in decode_ltc_frames(wav_path)} == {fps_type}
+
+    def test_drifting_noisy_recording_is_one_run(self, tmp_path):
+        """A noisy 24-bit stereo recording with a fast clock folds into one run."""
+        src = str(tmp_path / "src.wav")
+        generate_ltc_wav(1, 1, 0, 0, 0, 25 * 60, 48005, src)   # ~100 ppm fast
+        with wave.open(src) as wav:
+            mono = array.array("h", wav.readframes(wav.getnframes()))
+        rng = random.Random(1)
+        out = bytearray()
+        for v in mono:
+            v = int(v * 0.3) + rng.randint(-300, 300)
+            out += bytes(3) + (v * 256).to_bytes(3, "little", signed=True)
+        rec = str(tmp_path / "rec.wav")
+        with wave.open(rec, "w") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(3)
+            wav.setframerate(48000)
+            wav.writeframes(bytes(out))
+
+        assert build_index_for_wav(rec, channel=1) == 1
+        with LtcIndex(index_path_for(rec)) as index:
+            for k, tc in enumerate(_tcs((1, 0, 0, 0), 1, 25 * 60)):
+                assert abs(index.lookup(*tc) - frame_start_sample(k, 1, 48005)) <= 2
+
+    def test_noisy_shaped_recording(self, tmp_path):
+        """Shaped edges at 192 kHz under uniform noise of half the amplitude decode fully."""
+        src = str(tmp_path / "src.wav")
+        generate_ltc_wav(1, 1, 0, 0, 0, 250, 192000, src, shaped=True)
+        with wave.open(src) as wav:
+            mono = array.array("h", wav.readframes(wav.getnframes()))
+        rng = random.Random(2)
+        noise = [rng.randint(-8000, 8000) for _ in range(9973)]
+        noisy = array.array("h", (v + noise[i % 9973] for i, v in enumerate(mono)))
+        rec = str(tmp_path / "rec.wav")
+        with wave.open(rec, "w") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(192000)
+            wav.writeframes(noisy.tobytes())
+
+        frames = list(decode_ltc_frames(rec))
+        assert [fr[1:5] for fr in frames] == _tcs((1, 0, 0, 0), 1, 250)
+        assert all(abs(fr[0] - frame_start_sample(k, 1, 192000)) <= 8
+                   for k, fr in enumerate(frames))
+
+    def test_gap_splits_runs(self, tmp_path):
+        """Silence between segments starts a new run.
+
+        The first cell after digital silence can merge with it, so the check
+        uses a frame past the first one.
+        """
+        wav_path = str(tmp_path / "seg.wav")
+        segments = parse_segments(["0 1 0 0 0 1 2", "3 1 0 2 0 1 2"])
+        generate_ltc_segments_wav(segments, 48000, wav_path)
+        assert build_index_for_wav(wav_path) == 2
+        with LtcIndex(index_path_for(wav_path)) as index:
+            assert index.lookup(1, 0, 2, 1) == 3 * 48000 + frame_start_sample(1, 1, 48000)
@@ -0,0 +1,120 @@
+"""Tests for opt-in profiling hooks (reatc_profile.py)."""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from conftest import SRC_SCRIPTS
+from reatc_ltcgen import generate_ltc_segments_wav, parse_segments
+from reatc_profile import Profiler, parse_modes, pop_profile_args, start_profiling
+
+
+class TestParseModes:
+    """Test profile mode parsing."""
+
+    def test_off(self):
+        """Empty, None and "0" disable profiling."""
+        assert parse_modes(None) == ()
+        assert parse_modes("") == ()
+        assert parse_modes("0") == ()
+
+    def test_modes(self):
+        """"1" means cpu; comma lists are split."""
+        assert parse_modes("1") == ("cpu",)
+        assert parse_modes("cpu,mem") == ("cpu", "mem")
+
+    def test_unknown_mode(self):
+        """Unknown modes raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_modes("gpu")
+
+
+class TestPopProfileArgs:
+    """Test stripping profile flags from hand-parsed argv."""
+
+    def test_pop(self):
+        """Flags are removed and positional arguments keep their order."""
+        argv = ["ltcgen", "--profile=mem", "1", "--profile-dir=/tmp/x", "2"]
+        assert pop_profile_args(argv) == ("mem", "/tmp/x")
+        assert argv == ["ltcgen", "1", "2"]
+
+    def test_space_separated(self):
+        """"--profile cpu" and "--profile-dir DIR" work like the = forms."""
+        argv = ["ltcgen", "--profile", "cpu", "1", "--profile-dir", "/tmp/x", "2"]
+        assert pop_profile_args(argv) == ("cpu", "/tmp/x")
+        assert argv == ["ltcgen", "1", "2"]
+
+    def test_missing_value(self):
+        """A trailing flag without a value raises ValueError."""
+        with pytest.raises(ValueError):
+            pop_profile_args(["ltcgen", "--profile"])
+
+    def test_absent(self):
+        """Missing flags return None and leave argv unchanged."""
+        argv = ["ltcgen", "1"]
+        assert pop_profile_args(argv) == (None, None)
+        assert argv == ["ltcgen", "1"]
+
+
+class TestProfiler:
+    """Test report writing."""
+
+    def test_disabled_returns_none(self, monkeypatch):
+        """No flag and no environment variable means no profiler."""
+        monkeypatch.delenv("REATC_PROFILE", raising=False)
+        assert start_profiling("test") is None
+
+    def test_bad_environment_is_ignored(self, monkeypatch, capsys):
+        """An unknown mode in REATC_PROFILE warns instead of raising."""
+        monkeypatch.setenv("REATC_PROFILE", "gpu")
+        assert start_profiling("test") is None
+        assert "REATC_PROFILE" in capsys.readouterr().err
+
+    @pytest.mark.parametrize("script, args", [
+        ("reatc_ltcgen.py", ["1", "0", "0", "0", "0", "1", "48000", "out.wav"]),
+        ("reatc_osc.py", ["127.0.0.1", "9000", "/tc"]),
+    ])
+    def test_bad_mode_is_a_usage_error(self, tmp_path, script, args):
+        """--profile bogus exits non-zero with a message, not a traceback."""
+        result = subprocess.run(
+            [sys.executable, str(SRC_SCRIPTS / script), *args, "--profile", "bogus"],
+            capture_output=True, text=True, cwd=tmp_path, stdin=subprocess.DEVNULL)
+        assert result.returncode != 0
+        assert "unknown profile mode" in result.stderr
+        assert "Traceback" not in result.stderr
+
+    def test_ltcgen_space_separated_flag(self, tmp_path):
+        """ltcgen profiles with "--profile cpu --profile-dir DIR"."""
+        result = subprocess.run(
+            [sys.executable, str(SRC_SCRIPTS / "reatc_ltcgen.py"), "1", "0", "0", "0", "0", "25",
+             "48000", str(tmp_path / "out.wav"), "--profile", "cpu",
+             "--profile-dir", str(tmp_path)],
+            capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        report = next(tmp_path.glob("ltcgen-*.txt")).read_text()
+        assert "frames_rendered" in report
+
+    def test_segments_count_frames(self, tmp_path):
+        """The segments renderer reports frames_rendered like the other paths."""
+        counters = {}
+        generate_ltc_segments_wav(parse_segments(["0 0 0 0 0 1 1.0", "2 1 0 0 0 3 0.5"]),
+                                  48000, str(tmp_path / "seg.wav"), counters=counters)
+        assert counters == {"frames_rendered": 25 + 15}
+
+    def test_report(self):
+        """Report contains counters, a pstats dump and memory stats."""
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler = Profiler("test", ("cpu", "mem"), tmp, top=5)
+            profiler.start()
+            profiler.add_counters(lambda: {"packets_sent": 3})
+            sum(range(1000))
+            paths = profiler.stop()
+            assert profiler.stop() == []  # idempotent (atexit runs it again)
+            assert any(p.endswith(".pstats") for p in paths)
+            report = Path(next(p for p in paths if p.endswith(".txt"))).read_text()
+            assert "packets_sent" in report
+            assert "cumulative" in report
+            assert "peak" in report
@@ -0,0 +1,370 @@
+"""Soak test for the output daemons (reatc_artnet.py, reatc_osc.py).
+
+Drives a daemon subprocess with a show-like TC stream (advancing at the real
+frame rate, compressed in time by a speed-up factor) mixed with malformed and
+out-of-range lines, and samples the child's RSS, CPU time and open file
+descriptors throughout.  Fails on memory or descriptor growth, or on CPU cost
+per line creeping up over the run.
+
+CPU time and lines handled come from the daemon's own status file (cpu_s is
+time.process_time(), written together with its counters), so even a short
+run can be judged; /proc and ps only count CPU in 10 ms ticks.
+
+Under pytest it runs a short soak (REATC_SOAK_FRAMES, default 60 000 frames).
+For an overnight-style soak run it directly, e.g.:
+
+    python3 tests/test_soak.py --daemon osc --frames 5000000 --speedup 2000
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import SRC_SCRIPTS
+from reatc_ltcgen import advance_tc
+
+# Lines the daemons must reject (rotated through at BAD_EVERY intervals)
+BAD_LINES = (
+    "garbage\n",
+    "1 2 3\n",
+    "1 2 3 4 x\n",
+    "99 0 0 0 1\n",          # hours out of range
+    "1 2 3 45 1\n",          # frames out of range
+    "1 2 3 4 9\n",           # tc_type out of range
+    "-1 0 0 0 1\n",
+)
+BAD_EVERY = 50
+
+# Growth limits (after warm-up)
+MAX_RSS_GROWTH_KB = 2048     # fitted RSS trend over the measured span
+MAX_FD_GROWTH = 0
+MAX_CPU_RATIO = 1.5          # CPU per line, last quarter vs first quarter
+MIN_CPU_WINDOW = 0.2         # s of CPU per quarter needed to judge (10 ms ticks)
+MIN_CPU_WINDOW_FINE = 0.01   # same, with the daemon's own cpu_s
+
+FPS = {0: 24, 1: 25, 2: 30000 / 1001, 3: 30}
+
+
+# ── Process sampling ─────────────────────────────────────────────────────────
+
+def sample_process(pid):
+    """Return (rss_kb, cpu_seconds, open_fds) for pid; fds is None if unknown."""
+    proc = Path(f"/proc/{pid}")
+    if proc.exists():
+        rss = 0
+        for line in (proc / "status").read_text().splitlines():
+            if line.startswith("VmRSS:"):
+                rss = int(line.split()[1])
+        fields = (proc / "stat").read_text().rsplit(")", 1)[1].split()
+        ticks = os.sysconf("SC_CLK_TCK")
+        cpu = (int(fields[11]) + int(fields[12])) / ticks   # utime + stime
+        fds = 0
+        for fd in os.listdir(proc / "fd"):
+            try:
+                if not os.readlink(proc / "fd" / fd).endswith(".status.tmp"):
+                    fds += 1      # the status file is briefly open on every write
+            except OSError:
+                pass              # closed while listing
+        return rss, cpu, fds
+    # macOS / BSD fallback
+    out = subprocess.run(["ps", "-o", "rss=,cputime=", "-p", str(pid)],
+                         capture_output=True, text=True).stdout.split()
+    if len(out) < 2:
+        raise ProcessLookupError(pid)
+    parts = [float(p) for p in out[1].replace("-", ":").split(":")]
+    cpu = 0.0
+    for part in parts:
+        cpu = cpu * 60 + part
+    return int(out[0]), cpu, None
+
+
+def read_status(path):
+    """Return a daemon status file as a dict (empty if not written yet)."""
+    status = {}
+    try:
+        text = Path(path).read_text()
+    except OSError:
+        return status
+    for line in text.splitlines():
+        key, _, value = line.partition("=")
+        status[key] = value
+    return status
+
+
+def slope(xs, ys):
+    """Least-squares slope of ys over xs (0 if degenerate)."""
+    n = len(xs)
+    if n < 2:
+        return 0.0
+    mx, my = sum(xs) / n, sum(ys) / n
+    var = sum((x - mx) ** 2 for x in xs)
+    if var == 0:
+        return 0.0
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var
+
+
+# ── Harness ──────────────────────────────────────────────────────────────────
+
+class UdpSink(threading.Thread):
+    """Receive and count datagrams so the daemon never hits ICMP errors."""
+
+    def __init__(self, port=0):
+        super().__init__(daemon=True)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self.sock.bind(("127.0.0.1", port))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.received = 0
+        self.running = True
+
+    def run(self):
+        while self.running:
+            try:
+                self.sock.recv(2048)
+                self.received += 1
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+    def close(self):
+        self.running = False
+        self.join(timeout=1)
+        self.sock.close()
+
+
+def feed_lines(stdin, n_frames, fps_type, speedup, counts):
+    """Write n_frames TC lines (plus bad lines) paced at fps * speedup."""
+    rate = FPS[fps_type] * speedup
+    h, m, s, f = 0, 0, 0, 0
+    t0 = time.perf_counter()
+    batch = []
+    for i in range(n_frames):
+        if i % BAD_EVERY == BAD_EVERY - 1:
+            batch.append(BAD_LINES[(i // BAD_EVERY) % len(BAD_LINES)])
+            counts["bad"] += 1
+        batch.append(f"{h} {m} {s} {f} {fps_type}\n")
+        counts["good"] += 1
+        h, m, s, f = advance_tc(h, m, s, f, fps_type)
+        if len(batch) >= 256:
+            stdin.write("".join(batch))
+            batch.clear()
+            ahead = (i + 1) / rate - (time.perf_counter() - t0)
+            if ahead > 0:
+                time.sleep(ahead)
+    stdin.write("".join(batch))
+    stdin.flush()
+
+
+def run_soak(daemon="osc", n_frames=30_000, fps_type=1, speedup=1000.0, sample_interval=0.1,
+             extra_args=()):
+    """Run one soak and return a result dict (samples, counts, daemon status)."""
+    sink = UdpSink(6454 if daemon == "artnet" else 0)   # Art-Net port is fixed
+    sink.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        status_path = Path(tmp) / "daemon.status"
+        if daemon == "artnet":
+            args = [str(SRC_SCRIPTS / "reatc_artnet.py"), "127.0.0.1"]
+        else:
+            args = [str(SRC_SCRIPTS / "reatc_osc.py"), "127.0.0.1", str(sink.port), "/tc"]
+        proc = subprocess.Popen(
+            [sys.executable, *args, "--status", str(status_path),
+             "--status-interval", str(sample_interval / 2), *extra_args],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, text=True, bufsize=1 << 16,
+        )
+        counts = {"good": 0, "bad": 0}
+        feeder = threading.Thread(target=feed_lines, daemon=True,
+                                  args=(proc.stdin, n_frames, fps_type, speedup, counts))
+        t0 = time.perf_counter()
+        feeder.start()
+
+        samples = []   # (elapsed, lines, rss_kb, cpu_s, fds)
+        fine_cpu = True
+        while feeder.is_alive():
+            time.sleep(sample_interval)
+            try:
+                rss, cpu, fds = sample_process(proc.pid)
+            except (OSError, ProcessLookupError, ValueError):
+                break
+            lines = counts["good"] + counts["bad"]
+            status = read_status(status_path)
+            if "cpu_s" in status:
+                # Lines the daemon handled and its CPU clock, from the same write
+                lines = int(status["packets_sent"]) + int(status["parse_errors"])
+                cpu = float(status["cpu_s"])
+            elif not samples:
+                continue          # first status write still pending
+            else:
+                fine_cpu = False
+            samples.append((time.perf_counter() - t0, lines, rss, cpu, fds))
+        feeder.join()
+        proc.stdin.close()
+        returncode = proc.wait(timeout=30)
+
+        status = read_status(status_path)
+
+    sink.close()
+    return {
+        "samples": samples,
+        "counts": counts,
+        "status": status,
+        "returncode": returncode,
+        "received": sink.received,
+        "min_cpu_window": MIN_CPU_WINDOW_FINE if fine_cpu else MIN_CPU_WINDOW,
+        "elapsed": time.perf_counter() - t0,
+    }
+
+
+def cpu_windows(samples):
+    """Return the samples spanning the first and last quarter of the measured lines.
+
+    Windows are cut by lines handled rather than by sample count, since the
+    daemon can take its input in bursts.
+    """
+    measured = samples[len(samples) // 5:]        # skip warm-up
+    first, last = measured[0][1], measured[-1][1]
+    quarter = (last - first) / 4
+    head = [s for s in measured if s[1] <= first + quarter]
+    tail = [s for s in measured if s[1] >= last - quarter]
+    # Each window needs two samples; extend to the next one if a burst skipped it
+    if len(head) < 2:
+        head = measured[:2]
+    if len(tail) < 2:
+        tail = measured[-2:]
+    return head, tail
+
+
+def cpu_judged(samples, min_cpu_window=MIN_CPU_WINDOW):
+    """True if both CPU windows hold enough CPU time to compare."""
+    head, tail = cpu_windows(samples)
+    return min(head[-1][3] - head[0][3], tail[-1][3] - tail[0][3]) >= min_cpu_window
+
+
+def check_trends(samples, min_cpu_window=MIN_CPU_WINDOW):
+    """Return a list of failure messages for growth trends (empty = pass).
+
+    The CPU check is skipped unless both windows hold min_cpu_window s of CPU.
+    """
+    failures = []
+    measured = samples[len(samples) // 5:]        # skip warm-up
+    if len(measured) < 4:
+        return failures
+
+    xs = [s[1] for s in measured]                 # lines written so far
+    rss = [s[2] for s in measured]
+    growth = slope(xs, rss) * (xs[-1] - xs[0])
+    if growth > MAX_RSS_GROWTH_KB:
+        failures.append(f"RSS trend +{growth:.0f} KiB over {xs[-1] - xs[0]} lines")
+
+    fds = [s[4] for s in measured if s[4] is not None]
+    if fds and max(fds) - min(fds) > MAX_FD_GROWTH:
+        failures.append(f"open fds grew {min(fds)} -> {max(fds)}")
+
+    if not cpu_judged(samples, min_cpu_window):
+        return failures
+    head, tail = cpu_windows(samples)
+    def cpu_per_line(window):
+        lines = window[-1][1] - window[0][1]
+        return (window[-1][3] - window[0][3]) / lines if lines else 0.0
+    first, last = cpu_per_line(head), cpu_per_line(tail)
+    if last > first * MAX_CPU_RATIO and last - first > 2e-6:
+        failures.append(f"CPU per line rose {first * 1e6:.1f} -> {last * 1e6:.1f} us")
+    return failures
+
+
+# ── pytest entry ─────────────────────────────────────────────────────────────
+
+SOAK_FRAMES = int(os.environ.get("REATC_SOAK_FRAMES", "60000"))
+
+
+@pytest.mark.parametrize("daemon, extra_args", [
+    ("osc", ()),
+    ("artnet", ()),
+    ("osc", ("--realtime",)),       # GC frozen and disabled after warm-up
+], ids=["osc", "artnet", "osc-realtime"])
+def test_daemon_soak(daemon, extra_args):
+    """Daemon stays flat in memory, fds and CPU/line under a long TC stream."""
+    try:
+        result = run_soak(daemon, n_frames=SOAK_FRAMES, speedup=2000.0, sample_interval=0.05,
+                          extra_args=extra_args)
+    except OSError as e:
+        pytest.skip(f"cannot bind UDP sink: {e}")
+    assert result["returncode"] == 0
+    assert int(result["status"]["parse_errors"]) == result["counts"]["bad"]
+    assert int(result["status"]["packets_sent"]) == result["counts"]["good"]
+    assert result["min_cpu_window"] == MIN_CPU_WINDOW_FINE
+    assert cpu_judged(result["samples"], MIN_CPU_WINDOW_FINE), "too little CPU to judge trend"
+    assert check_trends(result["samples"], MIN_CPU_WINDOW_FINE) == []
+
+
+def test_check_trends_detects_leaks():
+    """The trend checker flags growing RSS and fds, and passes flat samples."""
+    flat = [(i, i * 1000, 10_000, i * 0.01, 4) for i in range(20)]
+    assert check_trends(flat) == []
+    leaky = [(i, i * 1000, 10_000 + i * 500, i * 0.01, 4 + i // 10) for i in range(20)]
+    failures = check_trends(leaky)
+    assert any("RSS" in f for f in failures)
+    assert any("fds" in f for f in failures)
+    slowing = [(i, i * 1000, 10_000, 0.1 * i + 0.01 * i * i, 4) for i in range(40)]
+    assert any("CPU" in f for f in check_trends(slowing))
+
+
+def test_cpu_windows_follow_lines():
+    """CPU windows are cut by lines handled, so bursty input still gets compared."""
+    # Lines arrive in bursts every other sample; CPU per line doubles at the end
+    samples, lines, cpu = [], 0, 0.0
+    for i in range(40):
+        if i % 2:
+            lines += 1000
+            cpu += 0.01 if i < 30 else 0.02
+        samples.append((i, lines, 10_000, cpu, 4))
+    head, tail = cpu_windows(samples)
+    assert head[-1][1] > head[0][1] and tail[-1][1] > tail[0][1]
+    assert cpu_judged(samples, MIN_CPU_WINDOW_FINE)
+    assert any("CPU" in f for f in check_trends(samples, MIN_CPU_WINDOW_FINE))
+    assert not cpu_judged(samples)            # too little CPU for a tick-based clock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test a ReaTC output daemon")
+    parser.add_argument("--daemon", choices=("osc", "artnet"), default="osc")
+    parser.add_argument("--frames", type=int, default=1_000_000)
+    parser.add_argument("--fps-type", type=int, default=1, choices=range(4))
+    parser.add_argument("--speedup", type=float, default=1000.0,
+                        help="time compression factor over real frame rate")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="seconds between process samples")
+    parser.add_argument("--realtime", action="store_true",
+                        help="run the daemon with --realtime")
+    args = parser.parse_args()
+
+    result = run_soak(args.daemon, args.frames, args.fps_type, args.speedup, args.interval,
+                      ("--realtime",) if args.realtime else ())
+    samples = result["samples"]
+    print(f"{args.daemon}: {result['counts']['good']} frames + {result['counts']['bad']} bad lines"
+          f" in {result['elapsed']:.1f} s, {result['received']} packets received")
+    if samples:
+        print(f"RSS {samples[0][2]} -> {samples[-1][2]} KiB, CPU {samples[-1][3]:.1f} s,"
+              f" fds {samples[0][4]} -> {samples[-1][4]}")
+    print(f"daemon status: {result['status']}")
+    failures = check_trends(samples, result["min_cpu_window"])
+    if samples and not cpu_judged(samples, result["min_cpu_window"]):
+        print("CPU trend not judged: run too short")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures or result["returncode"] else 0)
+
+
+if __name__ == "__main__":
+    main()